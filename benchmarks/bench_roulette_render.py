@@ -0,0 +1,135 @@
+# benchmarks/bench_roulette_render.py
+"""Per-spin CPU time and allocations of the roulette rendering, before and after prerendering.
+
+    python benchmarks/bench_roulette_render.py [--spins 2000]
+
+A spin is the 12 animation frames plus the result table. "before" is the renderer as it was
+when every frame and table was formatted on demand; "after" is the prerendered one in bot.py.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import RED_NUMBERS, SPIN_ANIMATION, check_color, create_roulette_table  # noqa: E402
+
+
+# ---- before: rebuilt on every call ----
+def legacy_number_to_emoji(num):
+    emoji_map = {
+        0: "0️⃣", 1: "1️⃣", 2: "2️⃣", 3: "3️⃣", 4: "4️⃣", 5: "5️⃣", 6: "6️⃣", 7: "7️⃣", 8: "8️⃣", 9: "9️⃣",
+        10: "🔟", 11: "1️⃣1️⃣", 12: "1️⃣2️⃣", 13: "1️⃣3️⃣", 14: "1️⃣4️⃣", 15: "1️⃣5️⃣", 16: "1️⃣6️⃣",
+        17: "1️⃣7️⃣", 18: "1️⃣8️⃣", 19: "1️⃣9️⃣", 20: "2️⃣0️⃣", 21: "2️⃣1️⃣", 22: "2️⃣2️⃣", 23: "2️⃣3️⃣",
+        24: "2️⃣4️⃣", 25: "2️⃣5️⃣", 26: "2️⃣6️⃣", 27: "2️⃣7️⃣", 28: "2️⃣8️⃣", 29: "2️⃣9️⃣", 30: "3️⃣0️⃣",
+        31: "3️⃣1️⃣", 32: "3️⃣2️⃣", 33: "3️⃣3️⃣", 34: "3️⃣4️⃣", 35: "3️⃣5️⃣", 36: "3️⃣6️⃣", "00": "0️⃣0️⃣"
+    }
+    return emoji_map.get(num, str(num))
+
+
+def legacy_spinner(ball_position):
+    wheel_segments = [
+        ("0", "🟢"), ("32", "🔴"), ("15", "⚫"), ("19", "🔴"), ("4", "⚫"), ("21", "🔴"), ("2", "⚫"), ("25", "🔴"), ("17", "⚫"), ("34", "🔴"),
+        ("6", "⚫"), ("27", "🔴"), ("13", "⚫"), ("36", "🔴"), ("11", "⚫"), ("30", "🔴"), ("8", "⚫"), ("23", "🔴"), ("10", "⚫"), ("5", "🔴"),
+        ("24", "⚫"), ("16", "🔴"), ("33", "⚫"), ("1", "🔴"), ("20", "⚫"), ("14", "🔴"), ("31", "⚫"), ("9", "🔴"), ("22", "⚫"), ("18", "🔴"),
+        ("29", "⚫"), ("7", "🔴"), ("28", "⚫"), ("12", "🔴"), ("35", "⚫"), ("3", "🔴"), ("26", "⚫"), ("00", "🟢")
+    ]
+    wheel = []
+    for i, (num, color) in enumerate(wheel_segments):
+        if i == ball_position % len(wheel_segments):
+            wheel.append(f"⚪{legacy_number_to_emoji(num)}{color}")
+        else:
+            wheel.append(f"  {legacy_number_to_emoji(num)}{color}")
+    return (
+        f"```\n"
+        f"        {wheel[0]}  {wheel[1]}  {wheel[2]}  {wheel[3]}        \n"
+        f"    {wheel[4]}  {wheel[5]}  {wheel[6]}  {wheel[7]}  {wheel[8]}    \n"
+        f"  {wheel[9]}  {wheel[10]}  {wheel[11]}  {wheel[12]}  {wheel[13]}  \n"
+        f"  {wheel[14]}  {wheel[15]}  {wheel[16]}  {wheel[17]}  {wheel[18]}  \n"
+        f"    {wheel[19]}  {wheel[20]}  {wheel[21]}  {wheel[22]}  {wheel[23]}    \n"
+        f"        {wheel[24]}  {wheel[25]}  {wheel[26]}  {wheel[27]}        \n"
+        f"            {wheel[28]}  {wheel[29]}  {wheel[30]}            \n"
+        f"```"
+    )
+
+
+def legacy_table(result, color):
+    columns = []
+    for col in (["3", "6", "9", "12", "15", "18", "21", "24", "27", "30", "33", "36"],
+                ["2", "5", "8", "11", "14", "17", "20", "23", "26", "29", "32", "35"],
+                ["1", "4", "7", "10", "13", "16", "19", "22", "25", "28", "31", "34"]):
+        display = []
+        for n in col:
+            num = int(n)
+            display.append(f"{legacy_number_to_emoji(num)}{'🔴' if num in RED_NUMBERS else '⚫'}")
+        columns.append(display)
+    if result in [0, "00"]:
+        result_display = f"{legacy_number_to_emoji(result)} 🟢"
+    else:
+        result_display = f"{legacy_number_to_emoji(int(result))} {'🔴' if color == 'red' else '⚫'}"
+    rows = "".join(f"║  {' '.join(display[:6])}  ║\n║  {' '.join(display[6:])}  ║\n" for display in columns)
+    return (
+        f"╔════════════════════════════════════════════════════════════╗\n"
+        f"║                       🎯 **RESULT** 🎯                      ║\n"
+        f"║                                                           ║\n"
+        f"║                    **{result_display}**                      ║\n"
+        f"║                                                           ║\n"
+        f"╠════════════════════════════════════════════════════════════╣\n"
+        f"║  COL 1          COL 2          COL 3                      ║\n"
+        f"{rows}"
+        f"║                                                           ║\n"
+        f"║                    0️⃣        🟢        0️⃣0️⃣                ║\n"
+        f"╚════════════════════════════════════════════════════════════╝"
+    )
+
+
+def legacy_spin(result):
+    frames = []
+    for i in range(12):
+        status = "**🏀 Ball is spinning...**" if i < 4 else "**🏀⚡ Ball is spinning faster...**" if i < 8 else "**🏀🎯 Ball is slowing down...**"
+        frames.append(f"{legacy_spinner(i * 3)}\n\n{status}")
+    return frames, legacy_table(result, check_color(result))
+
+
+# ---- after: prerendered in bot.py ----
+def spin(result):
+    return SPIN_ANIMATION, create_roulette_table(result)
+
+
+def measure(spin_fn, results):
+    start = time.perf_counter()
+    for result in results:
+        spin_fn(result)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for result in results[:200]:
+        spin_fn(result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / len(results), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spins", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    results = [rng.choice(list(range(37)) + ["00"]) for _ in range(args.spins)]
+
+    print(f"🎡 {args.spins} spins (12 frames + result table each)")
+    print(f"{'renderer':<8} {'µs/spin':>9} {'peak KB':>9}")
+    baseline = None
+    for name, fn in (("before", legacy_spin), ("after", spin)):
+        per_spin, peak = measure(fn, results)
+        baseline = baseline or per_spin
+        print(f"{name:<8} {per_spin * 1e6:>9.1f} {peak / 1024:>9.1f}   {baseline / per_spin:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
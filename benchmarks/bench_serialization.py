@@ -0,0 +1,66 @@
+# benchmarks/bench_serialization.py
+"""Serialize/parse time and size of an economy document in each STORAGE_FORMAT.
+
+    python benchmarks/bench_serialization.py [--accounts 100000] [--repeat 5]
+
+"wire" is the size after base64, which is what a GitHub contents PUT actually sends.
+"""
+import argparse
+import base64
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import encode_document, decode_document  # noqa: E402
+
+
+def make_economy(accounts, seed=1):
+    rng = random.Random(seed)
+    users = {}
+    for i in range(accounts):
+        user_id = str(rng.randrange(10**17, 10**18 + 10**17))
+        users[user_id] = {
+            "balance": rng.randrange(0, 200000),
+            "total_won": rng.randrange(0, 10**6),
+            "total_lost": rng.randrange(0, 10**6),
+            "last_daily": rng.choice([None, time.time() - rng.randrange(0, 10**7)]),
+        }
+    return {"users": users}
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    economy = make_economy(args.accounts)
+    print(f"📦 {args.accounts} accounts, best of {args.repeat}")
+    print(f"{'format':<8} {'encode ms':>10} {'decode ms':>10} {'bytes':>12} {'wire':>12} {'vs pretty':>10}")
+
+    baseline = None
+    for format in ("pretty", "json", "zlib"):
+        encode_time, content = best_of(args.repeat, lambda: encode_document(economy, format))
+        decode_time, decoded = best_of(args.repeat, lambda: decode_document(content))
+        assert decoded == economy
+        size = len(content.encode("utf-8"))
+        wire = len(base64.b64encode(content.encode("utf-8")))
+        baseline = baseline or wire
+        print(f"{format:<8} {encode_time * 1000:>10.1f} {decode_time * 1000:>10.1f} {size:>12,} {wire:>12,} {wire / baseline:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# benchmarks/simulate_blackjack.py
+"""Monte Carlo house edge of /blackjack under a fixed player strategy, batched with NumPy.
+
+    python benchmarks/simulate_blackjack.py [--hands 1000000] [--strategy basic] [--decks 1]
+
+Plays the exact BlackjackGame rules: a freshly shuffled deck every hand, dealer stands on all
+17s, blackjack pays int(bet * 2.5), a player 21 stands by itself, and there is no doubling,
+splitting or insurance. The player only hits or stands, as the chosen strategy table says.
+
+Before simulating, a sample of decks is played through both this simulator and the real
+BlackjackGame (with the deck injected), and every payout has to match. The run also times
+BlackjackGame itself, so it doubles as a benchmark of the game engine.
+
+Needs numpy, which the bot itself doesn't (pip install numpy).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import DECK, RANK_VALUES, BlackjackGame  # noqa: E402
+
+ACE = 11
+VALUES = np.array(RANK_VALUES, dtype=np.int8)
+RESULTS = ("blackjack", "win", "dealer_bust", "push", "loss", "bust")
+
+
+def strategy_table(name):
+    """HIT[soft, total, dealer up card value] for totals 0-31 and up cards 2-11"""
+    hit = np.zeros((2, 32, 12), dtype=bool)
+    if name == "basic":
+        # Hit/stand basic strategy for a dealer standing on soft 17
+        hit[0, :12] = True
+        hit[0, 12, [2, 3, 7, 8, 9, 10, 11]] = True
+        hit[0, 13:17, 7:] = True
+        hit[1, :18] = True
+        hit[1, 18, 9:] = True
+    elif name == "mimic":
+        # Play like the dealer: hit anything under 17
+        hit[:, :17] = True
+    elif name == "cautious":
+        # Never risk a bust on a hard hand
+        hit[0, :12] = True
+        hit[1, :18] = True
+    else:
+        raise ValueError(f"unknown strategy {name!r}")
+    return hit
+
+
+def add_card(total, soft, value):
+    """Vectorized Hand.add: aces count 11 until the total would bust"""
+    total += value
+    soft += value == ACE
+    for _ in range(2):  # one new card can need two aces dropped (e.g. soft 21 + ace)
+        drop = (total > 21) & (soft > 0)
+        total -= 10 * drop
+        soft -= drop
+
+
+def play(decks, hit, bet):
+    """Play one hand per row of ``decks`` (cards in dealing order); returns (payouts, result codes)"""
+    hands = len(decks)
+    rows = np.arange(hands)
+    values = VALUES[decks].astype(np.int16)
+    player = values[:, 0].copy()
+    player_soft = (player == ACE).astype(np.int16)
+    add_card(player, player_soft, values[:, 2])
+    dealer = values[:, 1].copy()
+    dealer_soft = (dealer == ACE).astype(np.int16)
+    up = values[:, 3]  # the dealer's second card is the face-up one
+    add_card(dealer, dealer_soft, up.copy())
+    drawn = np.full(hands, 4)
+
+    blackjack = player == 21
+    active = ~blackjack & hit[(player_soft > 0).astype(np.intp), player, up]
+    while active.any():
+        index = rows[active]
+        card = values[index, drawn[index]]
+        drawn[index] += 1
+        total, soft = player[index], player_soft[index]
+        add_card(total, soft, card)
+        player[index], player_soft[index] = total, soft
+        active[index] = (total < 21) & hit[(soft > 0).astype(np.intp), np.minimum(total, 31), up[index]]
+
+    bust = player > 21
+    active = ~bust & (dealer < 17)
+    while active.any():
+        index = rows[active]
+        card = values[index, drawn[index]]
+        drawn[index] += 1
+        total, soft = dealer[index], dealer_soft[index]
+        add_card(total, soft, card)
+        dealer[index], dealer_soft[index] = total, soft
+        active[index] = total < 17
+
+    win_payout = np.where(blackjack, int(bet * 2.5), bet * 2)
+    payouts = np.select(
+        [bust, dealer > 21, dealer < player, dealer == player],
+        [0, win_payout, win_payout, bet],
+        default=0,
+    )
+    results = np.select(
+        [bust, blackjack & (dealer != 21), dealer > 21, dealer < player, dealer == player],
+        [5, 0, 2, 1, 3],
+        default=4,
+    )
+    return payouts, results
+
+
+def shuffled_decks(rng, hands, decks):
+    """One independently shuffled deck per hand, trimmed to the most cards a hand can use"""
+    size = len(DECK) * decks
+    order = np.argsort(rng.random((hands, size)), axis=1)[:, :min(size, 48)]
+    return (order % len(DECK)).astype(np.int16)
+
+
+def play_scalar(deck, hit, bet):
+    """The same hand through BlackjackGame itself, dealt from ``deck`` in order"""
+    game = BlackjackGame(0, bet)
+    game.deck = [int(card) for card in reversed(deck)]  # the game deals with pop()
+    game.start_game()
+    while not game.game_over:
+        hand = game.player_hand
+        if hit[int(hand.soft_aces > 0), hand.score, game.dealer_up_score]:
+            game.hit()
+        else:
+            game.stand()
+    return game.payout
+
+
+def cross_check(rng, hands, decks, hit, bet):
+    """Play the same decks both ways and stop on the first payout that differs; returns scalar hands/s"""
+    sample = shuffled_decks(rng, hands, decks)
+    payouts, _ = play(sample, hit, bet)
+    start = time.perf_counter()
+    expected = [play_scalar(deck, hit, bet) for deck in sample]
+    rate = hands / (time.perf_counter() - start)
+    for deck, payout, paid in zip(sample, payouts, expected):
+        if payout != paid:
+            raise SystemExit(f"❌ Simulator paid {payout}, BlackjackGame paid {paid} for deck {deck.tolist()}")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hands", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=200000, help="hands per NumPy batch")
+    parser.add_argument("--strategy", default="basic", choices=["basic", "mimic", "cautious"])
+    parser.add_argument("--decks", type=int, default=1, help="decks shuffled together for each hand")
+    parser.add_argument("--bet", type=int, default=100)
+    parser.add_argument("--check", type=int, default=5000, help="hands cross-checked against BlackjackGame")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    hit = strategy_table(args.strategy)
+
+    scalar_rate = cross_check(rng, args.check, args.decks, hit, args.bet)
+    print(f"✅ {args.check} hands match BlackjackGame ({scalar_rate:,.0f} hands/s through the game engine)")
+
+    count = 0
+    net_sum = net_sq = 0.0
+    outcomes = {}
+    result_counts = np.zeros(len(RESULTS), dtype=np.int64)
+    start = time.perf_counter()
+    while count < args.hands:
+        hands = min(args.batch, args.hands - count)
+        payouts, results = play(shuffled_decks(rng, hands, args.decks), hit, args.bet)
+        net = payouts.astype(np.float64) - args.bet
+        net_sum += net.sum()
+        net_sq += (net * net).sum()
+        for value, times in zip(*np.unique(net, return_counts=True)):
+            outcomes[value] = outcomes.get(value, 0) + int(times)
+        result_counts += np.bincount(results, minlength=len(RESULTS))
+        count += hands
+    elapsed = time.perf_counter() - start
+
+    mean = net_sum / count
+    variance = net_sq / count - mean * mean
+    stderr = (variance / count) ** 0.5
+    print(f"🃏 {count:,} hands, {args.strategy} strategy, {args.decks} deck(s), bet {args.bet} "
+          f"— {count / elapsed:,.0f} hands/s vectorized ({count / elapsed / scalar_rate:,.0f}x scalar)")
+    print(f"EV per hand   {mean:+.3f} PNG ({mean / args.bet:+.3%} of the bet, ±{1.96 * stderr / args.bet:.3%} at 95%)")
+    print(f"House edge    {-mean / args.bet:.3%}")
+    print(f"Variance      {variance / args.bet ** 2:.4f} bets² (std dev {variance ** 0.5 / args.bet:.3f} bets)")
+    print(f"{'net':>8} {'share':>8}")
+    for value in sorted(outcomes):
+        print(f"{value:>+8.0f} {outcomes[value] / count:>8.3%}")
+    print(f"{'result':<12} {'share':>8}")
+    for name, times in zip(RESULTS, result_counts):
+        print(f"{name:<12} {times / count:>8.3%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,63 +6,272 @@ import json
 import os
 import math
 from datetime import datetime
-from flask import Flask
+from flask import Flask, jsonify
 import threading
 import time
 import random
 from discord.ui import View, Button, Modal, TextInput
 from discord.ext import tasks
 import base64
-import requests
+import hashlib
+import sqlite3
+import sys
+import zlib
+import contextlib
+import csv
+import io
+from collections import OrderedDict
+import difflib
+import re
+from array import array
+import bisect
+import aiohttp
+from sortedcontainers import SortedList
 import traceback
 import asyncio
 import math
 
-# ================= GITHUB STORAGE =================
-class GitHubStorage:
-    def __init__(self):
-        self.token = os.getenv("GITHUBTOKEN")
-        self.repo = "taesynreinhart1/png-bot"
-        self.branch = "main"
-        
-        self.is_production = bool(os.environ.get('RENDER') or os.environ.get('RAILWAY') or os.environ.get('DYNO'))
-        
-        self.economy_cache = {"users": {}}
-        self.leaderboard_cache = {}
-        self.economy_sha = None
-        self.leaderboard_sha = None
-        self.pending_saves = False
-        
-        print(f"🔧 Storage Mode: {'GitHub (Production)' if self.is_production and self.token else 'Local (Development)'}")
-        
-        if self.is_production and self.token:
-            self.load_all()
-            self.ensure_files_exist()
-    
-    def load_from_github(self, path):
-        """Load JSON directly from GitHub repo"""
-        url = f"https://api.github.com/repos/{self.repo}/contents/{path}?ref={self.branch}"
-        headers = {"Authorization": f"token {self.token}", "Accept": "application/vnd.github.v3+json"}
-        
+# ================= SERIALIZATION =================
+# First line of a compressed document; anything without it is plain JSON (older files are indented)
+ZLIB_HEADER = "PNGZ1\n"
+
+def encode_document(data, format="json"):
+    """Document text: "json" (minified), "pretty" (indent=4) or "zlib" (compressed, base85 after ZLIB_HEADER)"""
+    if format == "pretty":
+        return json.dumps(data, indent=4)
+    content = json.dumps(data, separators=(",", ":"))
+    if format == "zlib":
+        return ZLIB_HEADER + base64.b85encode(zlib.compress(content.encode("utf-8"), 6)).decode("ascii")
+    return content
+
+def decode_document(content):
+    """Parse text written by encode_document in any format (raises ValueError)"""
+    if content.startswith("PNGZ"):
+        header, _, payload = content.partition("\n")
+        if header + "\n" != ZLIB_HEADER:
+            raise ValueError(f"Unsupported document format {header!r}")
+        return json.loads(zlib.decompress(base64.b85decode(payload)))
+    return json.loads(content)
+
+# ================= STORAGE BACKENDS =================
+class StorageError(Exception):
+    """A backend could not read or write a document"""
+
+
+class StorageConflict(StorageError):
+    """The stored document changed since we last read or wrote it; writing would overwrite that change"""
+
+    def __init__(self, message, paths=()):
+        super().__init__(message)
+        self.paths = paths
+
+
+class StorageBackend:
+    """Where the JSON documents live. Documents are passed around as serialized text.
+
+    load() returns None when the document doesn't exist and raises StorageError on any other
+    failure; save() raises StorageError when the write didn't happen.
+    """
+    name = "Unknown"
+    flush_seconds = 5
+    # Print a line per flush (noisy for backends that flush every few seconds)
+    announce_flushes = False
+    # Last known request budget, None for backends without one
+    rate_remaining = None
+    rate_reset = None
+
+    def rate_limit_wait(self):
+        """Seconds until the backend will accept requests again (0 = go ahead)"""
+        return 0
+
+    def requests_per_flush(self, documents):
+        """How much of the request budget flushing this many documents costs"""
+        return 0
+
+    async def load(self, path):
+        raise NotImplementedError
+
+    async def save(self, path, content):
+        raise NotImplementedError
+
+    async def save_many(self, documents):
+        """Save {path: content}; returns {path: StorageError} for the ones that failed"""
+        failures = {}
+        for path, content in documents.items():
+            try:
+                await self.save(path, content)
+            except StorageError as e:
+                failures[path] = e
+        return failures
+
+    async def close(self):
+        pass
+
+
+class LocalFileBackend(StorageBackend):
+    """Files under a local directory, written atomically off the event loop"""
+    name = "Local"
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    async def load(self, path):
         try:
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                content = response.json()
-                decoded = base64.b64decode(content['content']).decode('utf-8')
-                return json.loads(decoded), content['sha']
-            else:
-                print(f"⚠️ GitHub file not found: {path}")
-                return None, None
-        except Exception as e:
-            print(f"❌ Error loading from GitHub: {e}")
-            return None, None
-    
-    def save_to_github(self, path, data, sha=None):
-        """Save JSON directly to GitHub repo"""
-        url = f"https://api.github.com/repos/{self.repo}/contents/{path}"
-        headers = {"Authorization": f"token {self.token}", "Accept": "application/vnd.github.v3+json"}
+            return await asyncio.to_thread(self.read_file, os.path.join(self.base_dir, path))
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise StorageError(f"could not read {path}: {e}") from e
+
+    async def save(self, path, content):
+        try:
+            await asyncio.to_thread(self.write_file, os.path.join(self.base_dir, path), content)
+        except OSError as e:
+            raise StorageError(f"could not write {path}: {e}") from e
+
+    def read_file(self, file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def write_file(self, file_path, content):
+        """Temp file + fsync + rename, so a crash never leaves a half-written file"""
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+
+
+class MemoryBackend(StorageBackend):
+    """Keeps documents in a dict; for tests and benchmarks, nothing survives a restart"""
+    name = "Memory"
+
+    def __init__(self, documents=None):
+        self.documents = dict(documents or {})
+
+    async def load(self, path):
+        return self.documents.get(path)
+
+    async def save(self, path, content):
+        self.documents[path] = content
+
+
+def git_blob_sha(content):
+    """The sha git gives a file's blob, so it can be known without asking GitHub"""
+    data = content.encode('utf-8')
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class GitHubBackend(StorageBackend):
+    """The repo's contents API, over one pooled keep-alive session.
+
+    With commit_mode="tree", save_many writes every dirty document in a single commit through
+    the Git Data API (tree + commit + ref update) instead of one contents PUT per file.
+    """
+    name = "GitHub"
+    announce_flushes = True
+    HTTP_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5)
+    HTTP_POOL_SIZE = 8
+    HTTP_MAX_CONCURRENCY = 4
+
+    def __init__(self, token, repo, branch, api_url, flush_seconds, commit_mode="contents"):
+        self.token = token
+        self.repo = repo
+        self.branch = branch
+        self.api_url = api_url.rstrip("/")
+        self.flush_seconds = flush_seconds
+        self.commit_mode = commit_mode
+        self.shas = {}
+        # (commit sha, tree sha) of the branch head after our last tree commit, saves two GETs per flush
+        self.head = None
+        # path -> (etag, sha, decoded text) of the last full download, for conditional GETs.
+        # Archived months are left out: they never change, and keeping their bodies here would hold
+        # the whole archive in memory past archive_cache's LRU.
+        self.etags = {}
+        # Shared keep-alive session; created lazily inside the running event loop
+        self.session = None
+        self.http_limit = None
+        # Epoch seconds before which GitHub asked us not to call again (Retry-After / exhausted budget)
+        self.retry_after = 0
+
+    def note_rate_limit(self, status, headers):
+        if "X-RateLimit-Remaining" in headers:
+            self.rate_remaining = int(headers["X-RateLimit-Remaining"])
+            self.rate_reset = int(headers.get("X-RateLimit-Reset", 0))
+        if headers.get("Retry-After"):
+            self.retry_after = time.time() + int(headers["Retry-After"])
+        elif status in (403, 429) and self.rate_remaining == 0:
+            self.retry_after = self.rate_reset
+
+    def rate_limit_wait(self):
+        return max(self.retry_after - time.time(), 0)
+
+    def requests_per_flush(self, documents):
+        if self.commit_mode == "tree" and documents > 1:
+            return 3 if self.head else 6
+        return documents
+
+    async def get_session(self):
+        """Return the pooled HTTP session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.HTTP_POOL_SIZE, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.HTTP_TIMEOUT,
+                headers={"Authorization": f"token {self.token}", "Accept": "application/vnd.github.v3+json"}
+            )
+            self.http_limit = asyncio.Semaphore(self.HTTP_MAX_CONCURRENCY)
+        return self.session
+
+    async def close(self):
+        """Close the HTTP session (cancels nothing, in-flight calls finish first)"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.http_limit = None
+
+    async def request(self, method, path, **kwargs):
+        """Send one request to the repo API (path like "contents/x.json"), returns (status, json body or None, headers)"""
+        session = await self.get_session()
+        url = f"{self.api_url}/repos/{self.repo}/{path}"
+        try:
+            async with self.http_limit:
+                async with session.request(method, url, **kwargs) as response:
+                    self.note_rate_limit(response.status, response.headers)
+                    body = None
+                    if response.content_type == "application/json":
+                        body = await response.json()
+                    return response.status, body, response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise StorageError(f"{method} {path} failed: {e!r}") from e
+
+    async def load(self, path):
+        """Download a file, revalidating with the cached ETag"""
+        headers = {}
+        cached = self.etags.get(path)
+        if cached:
+            headers["If-None-Match"] = cached[0]
         
-        content = json.dumps(data, indent=4)
+        status, content, resp_headers = await self.request(
+            "GET", f"contents/{path}", params={"ref": self.branch}, headers=headers
+        )
+        if status == 304:
+            # Unchanged since our last download: no body was transferred
+            return cached[2]
+        elif status == 200:
+            decoded = base64.b64decode(content['content']).decode('utf-8')
+            self.shas[path] = content['sha']
+            if resp_headers.get("ETag") and not is_archived_month_path(path):
+                self.etags[path] = (resp_headers["ETag"], content['sha'], decoded)
+            return decoded
+        elif status == 404:
+            print(f"⚠️ GitHub file not found: {path}")
+            return None
+        raise StorageError(f"GitHub returned {status} loading {path}")
+
+    async def save(self, path, content):
         encoded = base64.b64encode(content.encode('utf-8')).decode('utf-8')
         
         payload = {
@@ -70,136 +279,1181 @@ class GitHubStorage:
             "content": encoded,
             "branch": self.branch
         }
-        if sha:
-            payload["sha"] = sha
+        if self.shas.get(path):
+            payload["sha"] = self.shas[path]
         
+        status, body, _ = await self.request("PUT", f"contents/{path}", json=payload)
+        if status in [409, 422]:
+            # Never adopt the remote sha here, or the retry would overwrite whatever changed it
+            if await self.remote_sha(path) != self.shas.get(path):
+                raise StorageConflict(f"{path} was changed on GitHub outside the bot; not overwriting it (restart to reload it)", [path])
+            raise StorageError(f"GitHub rejected the write to {path} ({status}), will retry")
+        if status not in [200, 201]:
+            raise StorageError(f"GitHub save failed: {status}")
+        print(f"✅ Saved to GitHub: {path}")
+        # Our download is stale now; the PUT response carries the new sha
+        self.etags.pop(path, None)
+        self.shas[path] = body["content"]["sha"]
+        self.head = None  # that PUT made a commit of its own
+
+    async def remote_sha(self, path):
+        """Blob sha of the file on the branch right now (None if it doesn't exist), without touching our caches"""
+        status, content, _ = await self.request("GET", f"contents/{path}", params={"ref": self.branch})
+        if status == 404:
+            return None
+        if status != 200:
+            raise StorageError(f"GitHub returned {status} checking {path}")
+        return content["sha"]
+
+    async def save_many(self, documents):
+        if self.commit_mode != "tree" or len(documents) < 2:
+            return await super().save_many(documents)
         try:
-            response = requests.put(url, headers=headers, json=payload)
-            if response.status_code in [200, 201]:
-                print(f"✅ Saved to GitHub: {path}")
-                return True
-            else:
-                print(f"❌ GitHub save failed: {response.status_code}")
-                return False
-        except Exception as e:
-            print(f"❌ Error saving to GitHub: {e}")
-            return False
-    
-    def ensure_files_exist(self):
-        """Create economy.json and leaderboard.json on GitHub if they don't exist"""
-        if not self.is_production or not self.token:
-            return
+            await self.commit_tree(documents)
+            return {}
+        except StorageConflict as e:
+            # The conflicting files stay behind; everything else still goes out
+            failures = {path: e for path in e.paths}
+            rest = {path: content for path, content in documents.items() if path not in failures}
+            failures.update(await self.save_many(rest) if rest else {})
+            return failures
+        except StorageError as e:
+            # All or nothing: the ref only moves once the whole commit exists
+            return {path: e for path in documents}
+
+    async def get_json(self, method, path, expected, **kwargs):
+        status, body, _ = await self.request(method, path, **kwargs)
+        if status != expected:
+            raise StorageError(f"GitHub {method} {path} returned {status}")
+        return body
+
+    async def commit_tree(self, documents):
+        """One commit containing every document: new tree on top of the head, then move the branch"""
+        if self.head is None:
+            ref = await self.get_json("GET", f"git/ref/heads/{self.branch}", 200)
+            commit = await self.get_json("GET", f"git/commits/{ref['object']['sha']}", 200)
+            # A head we didn't make may carry other edits to these files; committing on top would undo them
+            tree = await self.get_json("GET", f"git/trees/{commit['tree']['sha']}", 200, params={"recursive": "1"})
+            remote = {entry["path"]: entry["sha"] for entry in tree["tree"] if entry["type"] == "blob"}
+            changed = sorted(path for path in documents if remote.get(path) != self.shas.get(path))
+            if changed:
+                raise StorageConflict(f"{', '.join(changed)} changed on GitHub outside the bot; not overwriting (restart to reload)", changed)
+            self.head = (commit["sha"], commit["tree"]["sha"])
+        head_sha, base_tree = self.head
         
-        print("📝 Checking if GitHub files exist...")
+        tree = await self.get_json("POST", "git/trees", 201, json={
+            "base_tree": base_tree,
+            "tree": [
+                {"path": path, "mode": "100644", "type": "blob", "content": content}
+                for path, content in documents.items()
+            ]
+        })
+        commit = await self.get_json("POST", "git/commits", 201, json={
+            "message": f"Update {', '.join(sorted(documents))} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "tree": tree["sha"],
+            "parents": [head_sha]
+        })
+        status, _, _ = await self.request(
+            "PATCH", f"git/refs/heads/{self.branch}", json={"sha": commit["sha"], "force": False}
+        )
+        if status != 200:
+            # Someone else moved the branch (or it was a contents PUT of ours): re-read it next time
+            self.head = None
+            raise StorageError(f"GitHub ref update returned {status}")
         
-        # Check/create economy.json
-        econ_data, econ_sha = self.load_from_github("economy.json")
-        if econ_data is None:
-            print("📝 Creating economy.json on GitHub...")
-            initial_econ = {"users": {}}
-            success = self.save_to_github("economy.json", initial_econ, None)
-            if success:
-                print("✅ Created economy.json")
-                _, self.economy_sha = self.load_from_github("economy.json")
-                self.economy_cache = initial_econ
+        self.head = (commit["sha"], tree["sha"])
+        for path, content in documents.items():
+            self.etags.pop(path, None)
+            self.shas[path] = git_blob_sha(content)
+        print(f"✅ Saved to GitHub in one commit: {', '.join(sorted(documents))}")
+
+# ================= FLUSH SCHEDULER =================
+class FlushScheduler:
+    """Picks the delay before the next auto_save.
+
+    After a good flush the delay shrinks from base_interval as unsaved changes pile up, but never
+    below what the backend's remaining rate budget can pay for before it resets. After a failed
+    flush it backs off exponentially with jitter. A Retry-After from the backend always wins.
+    """
+    BUDGET_SHARE = 0.5  # leave the rest of the rate limit for everything else
+    CHANGES_PER_HALVING = 200
+
+    def __init__(self, base_interval):
+        self.base_interval = base_interval
+        self.min_interval = max(base_interval / 10, 1)
+        self.max_interval = base_interval * 4
+        self.interval = base_interval
+        self.failures = 0
+        self.last_error = None
+
+    def budget_floor(self, backend, documents):
+        cost = backend.requests_per_flush(max(documents, 1))
+        if not cost or backend.rate_remaining is None or not backend.rate_reset:
+            return 0
+        window = max(backend.rate_reset - time.time(), 0)
+        flushes_left = backend.rate_remaining * self.BUDGET_SHARE / cost
+        return window if flushes_left < 1 else window / flushes_left
+
+    def plan(self, backend, dirty_documents, pending_changes, ok):
+        if ok:
+            self.failures = 0
+            target = self.base_interval / (1 + pending_changes / self.CHANGES_PER_HALVING)
+            delay = max(target, self.budget_floor(backend, dirty_documents))
         else:
-            print("✅ economy.json already exists")
-            self.economy_cache = econ_data
-            self.economy_sha = econ_sha
+            self.failures += 1
+            ceiling = min(self.max_interval, self.min_interval * 2 ** self.failures)
+            delay = random.uniform(ceiling / 2, ceiling)
         
-        # Check/create leaderboard.json
-        lb_data, lb_sha = self.load_from_github("leaderboard.json")
-        if lb_data is None:
-            print("📝 Creating leaderboard.json on GitHub...")
-            initial_lb = {}
-            success = self.save_to_github("leaderboard.json", initial_lb, None)
-            if success:
-                print("✅ Created leaderboard.json")
-                _, self.leaderboard_sha = self.load_from_github("leaderboard.json")
-                self.leaderboard_cache = initial_lb
+        delay = min(max(delay, self.min_interval), self.max_interval)
+        self.interval = max(delay, backend.rate_limit_wait())
+        return self.interval
+
+# ================= ACCOUNT STORE =================
+ACCOUNT_FIELDS = ("balance", "total_won", "total_lost", "last_daily")
+# Stands for a last_daily of None in the int64 column
+NO_DAILY = -2**63
+
+
+class Account:
+    """One account of an AccountStore, read and written like the old account dict"""
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, field):
+        return self.store.get_field(self.row, field)
+
+    def __setitem__(self, field, value):
+        self.store.set_field(self.row, field, value)
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(ACCOUNT_FIELDS) + list(self.store.extras.get(self.row, ()))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def to_dict(self):
+        return {field: self[field] for field in self.keys()}
+
+    def __repr__(self):
+        return f"Account({self.to_dict()})"
+
+
+class RankIndex:
+    """Sorted int64 keys, kept in array chunks of about CHUNK keys: a compact stand-in for a SortedList.
+
+    A key costs 8 bytes instead of the ~40 of a Python int in a list. A chunk is found by a
+    bisect over each chunk's last key, and an insert or removal shifts at most 2 * CHUNK keys.
+    Positions sum the lengths of the chunks before, which is O(n / CHUNK) but fast in C.
+    """
+    CHUNK = 512
+
+    def __init__(self, keys=()):
+        keys = sorted(keys)
+        self.chunks = [array("q", keys[i:i + self.CHUNK]) for i in range(0, len(keys), self.CHUNK)]
+        self.maxes = [chunk[-1] for chunk in self.chunks]
+
+    def __len__(self):
+        return sum(map(len, self.chunks))
+
+    def add(self, key):
+        if not self.chunks:
+            self.chunks.append(array("q", [key]))
+            self.maxes.append(key)
+            return
+        i = min(bisect.bisect_left(self.maxes, key), len(self.chunks) - 1)
+        chunk = self.chunks[i]
+        chunk.insert(bisect.bisect_left(chunk, key), key)
+        self.maxes[i] = chunk[-1]
+        if len(chunk) > 2 * self.CHUNK:
+            self.chunks[i:i + 1] = [chunk[:self.CHUNK], chunk[self.CHUNK:]]
+            self.maxes[i:i + 1] = [chunk[self.CHUNK - 1], chunk[-1]]
+
+    def remove(self, key):
+        i = bisect.bisect_left(self.maxes, key)
+        chunk = self.chunks[i] if i < len(self.chunks) else ()
+        position = bisect.bisect_left(chunk, key)
+        if position == len(chunk) or chunk[position] != key:
+            raise ValueError(f"{key} not in RankIndex")
+        del chunk[position]
+        if chunk:
+            self.maxes[i] = chunk[-1]
         else:
-            print("✅ leaderboard.json already exists")
-            self.leaderboard_cache = lb_data
-            self.leaderboard_sha = lb_sha
-    
-    def load_all(self):
-        """Load both economy and leaderboard data from GitHub"""
-        if not self.is_production or not self.token:
+            del self.chunks[i], self.maxes[i]
+
+    def bisect_left(self, key):
+        """How many keys are below ``key``"""
+        i = bisect.bisect_left(self.maxes, key)
+        if i == len(self.chunks):
+            return len(self)
+        return sum(map(len, self.chunks[:i])) + bisect.bisect_left(self.chunks[i], key)
+
+    def islice(self, start, stop):
+        """[keys at positions start .. stop-1]"""
+        keys = []
+        for chunk in self.chunks:
+            if stop <= 0:
+                break
+            if start < len(chunk):
+                keys.extend(chunk[max(start, 0):stop])
+            start -= len(chunk)
+            stop -= len(chunk)
+        return keys
+
+
+class AccountStore:
+    """user id -> account, kept column-wise instead of as a dict per user.
+
+    Each field lives in an int64 array indexed by row. Snowflake user ids sit in an int64 id
+    column and are found through an open-addressing hash table of row numbers (int32, at most
+    half full), so an account costs about 60 bytes instead of the ~380 of a dict-of-dicts.
+    Indexing returns a live Account view; assigning a dict inserts or overwrites a whole
+    account. Ids that aren't snowflakes and fields other than ACCOUNT_FIELDS are rare and kept
+    in side dicts so documents round-trip unchanged. to_dict() gives back the "users" layout.
+
+    Balances are also kept ranked in a RankIndex (8 more bytes per account) that every balance
+    write updates, so the rich list reads a page and a rank without sorting the economy.
+    """
+    EMPTY = -1
+
+    def __init__(self, users=None):
+        self.ids = array("q")
+        self.columns = {field: array("q") for field in ACCOUNT_FIELDS}
+        self.bits = 4
+        self.table = array("i", [self.EMPTY]) * (1 << self.bits)
+        self.names = {}  # non-numeric user id -> row (their ids entry is EMPTY)
+        self.extras = {}  # row -> {field: value} for anything outside ACCOUNT_FIELDS
+        self.ranking = None  # rank_key of every row, richest first (built in one sort after a bulk load)
+        if users:
+            self.reserve(len(users))
+            self.update(users)
+        self.ranking = RankIndex(self.rank_key(balance, row) for row, balance in enumerate(self.columns["balance"]))
+
+    def key(self, user_id):
+        user_id = str(user_id)
+        if user_id.isdigit() and len(user_id) <= 19 and str(int(user_id)) == user_id and int(user_id) < 2**63:
+            return int(user_id)
+        return user_id
+
+    def slot(self, key):
+        """Table slot holding ``key``'s row, or the empty slot where it would go"""
+        mask = len(self.table) - 1
+        slot = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self.bits)
+        table, ids = self.table, self.ids
+        while table[slot] != self.EMPTY and ids[table[slot]] != key:
+            slot = (slot + 1) & mask
+        return slot
+
+    def row(self, user_id):
+        key = self.key(user_id)
+        if isinstance(key, str):
+            return self.names.get(key)
+        row = self.table[self.slot(key)]
+        return None if row == self.EMPTY else row
+
+    def reserve(self, accounts):
+        """Grow the table so ``accounts`` rows keep it at most half full"""
+        bits = self.bits
+        while (1 << bits) < accounts * 2:
+            bits += 1
+        if bits == self.bits:
             return
+        self.bits = bits
+        self.table = array("i", [self.EMPTY]) * (1 << bits)
+        for row, key in enumerate(self.ids):
+            if key != self.EMPTY:
+                self.table[self.slot(key)] = row
+
+    def rank_key(self, balance, row):
+        # Sorts by balance descending, then by account age; the row is the low 32 bits
+        return (-balance << 32) | row
+
+    def get_field(self, row, field):
+        column = self.columns.get(field)
+        if column is None:
+            return self.extras.get(row, {})[field]
+        value = column[row]
+        if field == "last_daily" and value == NO_DAILY:
+            return None
+        return value
+
+    def set_field(self, row, field, value):
+        column = self.columns.get(field)
+        if column is None:
+            self.extras.setdefault(row, {})[field] = value
+        elif field == "last_daily" and value is None:
+            column[row] = NO_DAILY
+        elif field == "balance" and self.ranking is not None:
+            old, column[row] = column[row], int(value)
+            if old != column[row]:
+                self.ranking.remove(self.rank_key(old, row))
+                self.ranking.add(self.rank_key(column[row], row))
+        else:
+            column[row] = int(value)
+
+    def row_user_id(self, row):
+        key = self.ids[row]
+        if key != self.EMPTY:
+            return str(key)
+        return next(name for name, named_row in self.names.items() if named_row == row)
+
+    def rank(self, user_id):
+        """1-based position on the rich list, or None for unknown users"""
+        row = self.row(user_id)
+        if row is None:
+            return None
+        return self.ranking.bisect_left(self.rank_key(self.columns["balance"][row], row)) + 1
+
+    def richest(self, start, count):
+        """[(user_id, account)] for ranks start+1 .. start+count"""
+        rows = [key & 0xFFFFFFFF for key in self.ranking.islice(start, start + count)]
+        return [(self.row_user_id(row), Account(self, row)) for row in rows]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, user_id):
+        return self.row(user_id) is not None
+
+    def __iter__(self):
+        names = {row: name for name, row in self.names.items()}
+        return (str(key) if key != self.EMPTY else names[row] for row, key in enumerate(self.ids))
+
+    def keys(self):
+        return iter(self)
+
+    def __getitem__(self, user_id):
+        row = self.row(user_id)
+        if row is None:
+            raise KeyError(user_id)
+        return Account(self, row)
+
+    def get(self, user_id, default=None):
+        row = self.row(user_id)
+        return default if row is None else Account(self, row)
+
+    def __setitem__(self, user_id, account):
+        row = self.row(user_id)
+        if row is None:
+            row = len(self.ids)
+            key = self.key(user_id)
+            if isinstance(key, str):
+                self.names[key] = row
+                self.ids.append(self.EMPTY)
+            else:
+                self.reserve(row + 1)
+                self.table[self.slot(key)] = row
+                self.ids.append(key)
+            for column in self.columns.values():
+                column.append(0)
+            if self.ranking is not None:
+                self.ranking.add(self.rank_key(0, row))
+        self.extras.pop(row, None)
+        for field in ACCOUNT_FIELDS:
+            self.set_field(row, field, account.get(field, 0))
+        for field in account.keys():
+            if field not in self.columns:
+                self.set_field(row, field, account[field])
+
+    def update(self, users):
+        for user_id, account in users.items():
+            self[user_id] = account
+
+    def items(self):
+        return ((user_id, Account(self, row)) for row, user_id in enumerate(self))
+
+    def values(self):
+        return (Account(self, row) for row in range(len(self.ids)))
+
+    def to_dict(self):
+        return {user_id: account.to_dict() for user_id, account in self.items()}
+
+
+# ================= STORAGE =================
+# Which layout the economy was last written in: {"shards": N}, 0 meaning the single economy.json
+ECONOMY_MANIFEST = "economy/manifest.json"
+ARCHIVE_DIR = "leaderboard/archive"
+ARCHIVE_INDEX = f"{ARCHIVE_DIR}/index.json"
+
+def archive_path(month_key):
+    return f"{ARCHIVE_DIR}/{month_key}.json"
+
+def is_archived_month_path(path):
+    return path.startswith(f"{ARCHIVE_DIR}/") and path != ARCHIVE_INDEX
+
+def add_rollups(into, rollups, sign=1):
+    """Add (or with sign=-1 subtract) {rollup key: {player: total}} into ``into``, dropping zeros"""
+    for key, totals in rollups.items():
+        target = into.setdefault(key, {})
+        for player, total in totals.items():
+            target[player] = target.get(player, 0) + sign * total
+            if not target[player]:
+                del target[player]
+        if not target:
+            del into[key]
+
+class Storage:
+    """In-memory economy/leaderboard caches, written behind to a StorageBackend.
+
+    With economy_shards > 0 the economy is persisted as that many economy/shard-NN.json files,
+    users assigned by a hash of their id, and a flush only rewrites the shards whose users changed.
+    """
+    LOAD_ATTEMPTS = 3
+    LOAD_RETRY_SECONDS = 2
+
+    def __init__(self, backend, journal=None, economy_shards=0, document_format="json"):
+        self.backend = backend
+        self.document_format = document_format
+        self.mode_name = backend.name
         
-        econ_data, self.economy_sha = self.load_from_github("economy.json")
-        if econ_data:
-            self.economy_cache = econ_data
-            print(f"💰 Loaded economy data: {len(econ_data.get('users', {}))} accounts")
+        self.economy_cache = {"users": AccountStore()}
+        self.leaderboard_cache = {}
+        # Closed months live in immutable compressed documents; the index lists them with their rollups
+        self.archive_index = {"months": [], "rollups": {}, "seasons": {}}
+        self.economy_shards = economy_shards
+        # shard path -> ids of the users stored in it
+        self.shard_members = {path: set() for path in self.economy_paths()} if economy_shards else {}
+        # Documents mutated since the last flush, and a digest of the bytes last committed per document
+        self.dirty = set()
+        self.committed_digests = {}
+        # path -> why it can't be saved: changed on the backend since we loaded it
+        self.conflicts = {}
+        # Crash safety between flushes: every account change is journaled to local disk first
+        self.journal = journal
+        self.scheduler = FlushScheduler(backend.flush_seconds)
+        # Backlog: saves since the last successful flush, and when the oldest of them happened
+        self.pending_changes = 0
+        self.dirty_since = None
         
-        lb_data, self.leaderboard_sha = self.load_from_github("leaderboard.json")
-        if lb_data:
-            self.leaderboard_cache = lb_data
-            print(f"📊 Loaded leaderboard data: {len(lb_data)} months")
+        print(f"🔧 Storage Mode: {backend.name}{f' ({economy_shards} economy shards)' if economy_shards else ''}")
+
+    async def startup(self):
+        """Boot phase, run from the bot's setup_hook before it connects to the gateway.
+
+        Raises StorageError when a document can't be read, so the bot never runs on (and later
+        flushes) an empty stand-in for it.
+        """
+        started = time.perf_counter()
+        await self.load_all()
+        loaded = time.perf_counter()
+        replayed = set()
+        if self.journal is not None:
+            replayed = self.journal.replay(self.economy_cache)
+            if replayed:
+                print(f"📒 Replayed {len(replayed)} accounts changed since the last committed flush")
+                self.mark_accounts_dirty(replayed)
+        finished = time.perf_counter()
+        print(f"⏱️ Storage boot: load {(loaded - started) * 1000:.0f}ms, "
+              f"journal {(finished - loaded) * 1000:.0f}ms ({len(replayed)} accounts), total {(finished - started) * 1000:.0f}ms")
+
+    def economy_paths(self, shards=None):
+        shards = self.economy_shards if shards is None else shards
+        if not shards:
+            return ["economy.json"]
+        return [f"economy/shard-{i:02d}.json" for i in range(shards)]
+
+    def shard_path(self, user_id):
+        return f"economy/shard-{zlib.crc32(str(user_id).encode()) % self.economy_shards:02d}.json"
+
+    def document(self, path):
+        if path == "leaderboard.json":
+            return self.leaderboard_cache
+        if path == ARCHIVE_INDEX:
+            return self.archive_index
+        if path == ECONOMY_MANIFEST:
+            return {"shards": self.economy_shards}
+        users = self.economy_cache["users"]
+        if path == "economy.json":
+            return {"users": users.to_dict()}
+        return {"users": {user_id: users[user_id].to_dict() for user_id in sorted(self.shard_members[path]) if user_id in users}}
+
+    def apply_document(self, path, data):
+        """Install a loaded document into the caches"""
+        if path == "leaderboard.json":
+            self.leaderboard_cache = data
+        elif path == ARCHIVE_INDEX:
+            self.archive_index = data
+        elif path == "economy.json":
+            self.economy_cache = {"users": AccountStore(data.get("users", {}))}
+        else:
+            self.economy_cache["users"].update(data["users"])
+            self.shard_members[path] = set(data["users"])
+
+    def serialize(self, data):
+        return encode_document(data, self.document_format)
+
+    def digest(self, content):
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    async def load_document(self, path):
+        """Parsed document, or None if the backend doesn't have it (raises StorageError)"""
+        content = await self.backend.load(path)
+        if content is None:
+            return None
+        self.committed_digests[path] = self.digest(content)
+        return decode_document(content)
+
+    async def save_document(self, path, content):
+        await self.backend.save(path, content)
+        self.committed_digests[path] = self.digest(content)
     
-    def get_economy(self):
-        if self.is_production and self.token:
-            return self.economy_cache
+    async def create_document(self, path, initial):
+        """Write ``initial`` for a document the backend reported missing"""
+        print(f"📝 Creating {path}...")
+        try:
+            await self.save_document(path, self.serialize(initial))
+        except StorageError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ Created {path}")
+        self.apply_document(path, initial)
+    
+    async def load_documents(self, paths):
+        """{path: parsed document, or None if it doesn't exist}, all fetched concurrently.
+
+        Reads that fail are retried a few times, then StorageError is raised. Unreachable isn't
+        missing: starting on an empty copy of a document would overwrite it at the next flush.
+        """
+        results = {}
+        remaining = list(paths)
+        for attempt in range(1, self.LOAD_ATTEMPTS + 1):
+            loaded = await asyncio.gather(*(self.load_document(path) for path in remaining), return_exceptions=True)
+            failed = []
+            for path, result in zip(remaining, loaded):
+                if isinstance(result, StorageError):
+                    print(f"❌ Error loading {path} (attempt {attempt}/{self.LOAD_ATTEMPTS}): {result}")
+                    failed.append(path)
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    results[path] = result
+            if not failed:
+                return results
+            remaining = failed
+            if attempt < self.LOAD_ATTEMPTS:
+                await asyncio.sleep(self.LOAD_RETRY_SECONDS * attempt)
+        raise StorageError(f"could not load {', '.join(remaining)}; refusing to start without it")
+
+    async def load_all(self):
+        """Fetch every document once, all concurrently, and create only the ones that are really missing"""
+        paths = self.economy_paths() + ["leaderboard.json", ARCHIVE_INDEX, ECONOMY_MANIFEST]
+        results = await self.load_documents(paths)
+        missing = []
+        manifest = None
+        for path, result in results.items():
+            if path == ECONOMY_MANIFEST:
+                manifest = result
+            elif result is None:
+                if path != ARCHIVE_INDEX:  # written by the first archive pass
+                    missing.append(path)
+            else:
+                self.apply_document(path, result)
+        
+        if manifest is not None:
+            written_shards = manifest["shards"]
         else:
-            try:
-                with open(ECON_FILE, "r") as f:
-                    return json.load(f)
-            except FileNotFoundError:
-                return {"users": {}}
+            # From before the manifest: sharded files already there were written with today's count
+            written_shards = 0 if set(self.economy_paths()) <= set(missing) else self.economy_shards
+        if written_shards != self.economy_shards:
+            await self.migrate_economy(written_shards)
+            missing = [path for path in missing if path not in self.economy_paths()]
+        elif manifest is None and self.economy_shards:
+            self.mark_dirty(ECONOMY_MANIFEST)
+        
+        await asyncio.gather(*(
+            self.create_document(path, {} if path == "leaderboard.json" else {"users": {}}) for path in missing
+        ))
+        
+        print(f"💰 Loaded economy data: {len(self.economy_cache.get('users', {}))} accounts")
+        print(f"📊 Loaded leaderboard data: {len(self.leaderboard_cache)} months, {len(self.archive_index['months'])} archived")
+
+    async def migrate_economy(self, written_shards):
+        """Reload the economy from the layout it was written in and mark it for rewriting in the configured one.
+
+        Whatever loaded from the configured layout is discarded: those files are stale leftovers
+        of an older layout, or missing. The manifest is only updated once the new files are saved.
+        """
+        old_paths = self.economy_paths(written_shards)
+        print(f"🔀 Economy is stored in {len(old_paths)} file(s) ({written_shards} shards), "
+              f"rewriting it for ECONOMY_SHARDS={self.economy_shards}")
+        users = AccountStore()
+        for path, data in (await self.load_documents(old_paths)).items():
+            if data is None and written_shards:
+                raise StorageError(f"{path} is missing but {ECONOMY_MANIFEST} says the economy has {written_shards} shards")
+            users.update((data or {}).get("users", {}))
+        self.economy_cache = {"users": users}
+        self.mark_all_accounts_dirty()
+        self.mark_dirty(ECONOMY_MANIFEST)
+
+    def get_economy(self):
+        return self.economy_cache
     
-    def save_economy(self, data):
-        if self.is_production and self.token:
-            self.economy_cache = data
-            self.pending_saves = True
+    def mark_dirty(self, path):
+        if self.dirty_since is None:
+            self.dirty_since = time.time()
+        self.dirty.add(path)
+        self.pending_changes += 1
+
+    def mark_all_accounts_dirty(self):
+        if self.economy_shards:
+            for members in self.shard_members.values():
+                members.clear()
+            for user_id in self.economy_cache["users"]:
+                self.shard_members[self.shard_path(user_id)].add(user_id)
+        for path in self.economy_paths():
+            self.mark_dirty(path)
+
+    def mark_accounts_dirty(self, user_ids):
+        """Mark the documents holding these accounts for the next flush"""
+        if not self.economy_shards:
+            self.mark_dirty("economy.json")
+            return
+        for user_id in user_ids:
+            path = self.shard_path(user_id)
+            self.shard_members[path].add(str(user_id))
+            self.mark_dirty(path)
+
+    def save_economy(self, data, *user_ids):
+        if not isinstance(data["users"], AccountStore):
+            data = {"users": AccountStore(data["users"])}
+        self.economy_cache = data
+        if user_ids:
+            self.mark_accounts_dirty(user_ids)
         else:
-            os.makedirs(os.path.dirname(ECON_FILE), exist_ok=True)
-            with open(ECON_FILE, "w") as f:
-                json.dump(data, f, indent=4)
+            self.mark_all_accounts_dirty()
+        if self.journal is not None:
+            for user_id in user_ids:
+                self.journal.record(user_id, data["users"][str(user_id)].to_dict())
+    
+    def top_balances(self, limit, start=0):
+        """[(user_id, account)] of the richest accounts, from rank start+1"""
+        return self.economy_cache["users"].richest(start, limit)
+
+    def balance_rank(self, user_id):
+        return self.economy_cache["users"].rank(user_id)
     
     def get_leaderboard(self):
-        if self.is_production and self.token:
-            return self.leaderboard_cache
-        else:
-            try:
-                with open(DATA_FILE, "r") as f:
-                    return json.load(f)
-            except FileNotFoundError:
-                return {}
+        return self.leaderboard_cache
     
-    def save_leaderboard(self, data):
-        if self.is_production and self.token:
-            self.leaderboard_cache = data
-            self.pending_saves = True
-        else:
-            os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-            with open(DATA_FILE, "w") as f:
-                json.dump(data, f, indent=4)
+    def save_leaderboard(self, data, *month_keys):
+        self.leaderboard_cache = data
+        self.mark_dirty("leaderboard.json")
+
+    def archived_months(self):
+        return self.archive_index["months"]
+
+    def archive_rollups(self):
+        return self.archive_index["rollups"]
+
+    async def load_archived_month(self, month_key):
+        """One archived month's data (raises StorageError)"""
+        data = await self.load_document(archive_path(month_key))
+        if data is None:
+            raise StorageError(f"Archive for {month_key} is missing")
+        return data
+
+    async def archive_months(self, months, contributions, seasons):
+        """Move closed months out of the live leaderboard into archive documents; returns the months moved.
+
+        The archives are written first, so a failure leaves the months live. A month edited while
+        they upload also stays live, for a later pass to archive. ``contributions`` is called with
+        the months that moved and returns their {rollup key: {player: total}} for the index.
+        """
+        encoded = {month_key: encode_document(data, "zlib") for month_key, data in months.items()}
+        documents = {archive_path(month_key): encoded[month_key] for month_key, data in months.items() if data}
+        failures = await self.backend.save_many(documents)
+        if failures:
+            raise next(iter(failures.values()))
+        for path, content in documents.items():
+            self.committed_digests[path] = self.digest(content)
+        
+        moved = {month_key: data for month_key, data in months.items()
+                 if month_key in self.leaderboard_cache and encode_document(self.leaderboard_cache[month_key], "zlib") == encoded[month_key]}
+        for month_key in moved:
+            del self.leaderboard_cache[month_key]
+        self.archive_index["months"] = sorted(set(self.archive_index["months"]) | {key for key, data in moved.items() if data})
+        add_rollups(self.archive_index["rollups"], contributions(moved))
+        self.archive_index["seasons"] = seasons
+        self.mark_dirty("leaderboard.json")
+        self.mark_dirty(ARCHIVE_INDEX)
+        return moved
+
+    def reopen_month(self, month_key, data, rollups):
+        """Bring an archived month back into the live leaderboard so it can be edited.
+
+        ``rollups`` is what the month contributed to the archive rollups. It is re-archived by
+        the next archive pass.
+        """
+        self.leaderboard_cache[month_key] = data
+        self.archive_index["months"].remove(month_key)
+        add_rollups(self.archive_index["rollups"], rollups, sign=-1)
+        self.mark_dirty("leaderboard.json")
+        self.mark_dirty(ARCHIVE_INDEX)
+
+    def replace_archive_rollups(self, rollups, seasons):
+        self.archive_index["rollups"] = rollups
+        self.archive_index["seasons"] = seasons
+        self.mark_dirty(ARCHIVE_INDEX)
     
+    def flush_status(self):
+        """Current flush interval and backlog, for the /status endpoint (call it on the bot's loop)"""
+        return {
+            "backend": self.backend.name,
+            "interval_seconds": round(self.scheduler.interval, 1),
+            "dirty_documents": sorted(self.dirty),
+            "pending_changes": self.pending_changes,
+            "oldest_change_seconds": round(time.time() - self.dirty_since, 1) if self.dirty_since else 0,
+            "consecutive_failures": self.scheduler.failures,
+            "last_error": self.scheduler.last_error,
+            "conflicts": dict(self.conflicts),
+            "rate_limit_remaining": self.backend.rate_remaining,
+        }
+    
+    def start_auto_save(self):
+        """Start the write-behind flusher (safe to call again on reconnect)"""
+        if self.auto_save.is_running():
+            return
+        self.auto_save.change_interval(seconds=self.backend.flush_seconds)
+        self.auto_save.start()
+        print(f"🔄 Auto-save started ({int(self.auto_save.seconds)}s)")
+
+    async def shutdown(self):
+        """Final flush once the bot has stopped"""
+        try:
+            await self.flush()
+        finally:
+            if self.journal is not None:
+                await self.journal.close()
+            await self.backend.close()
+
     @tasks.loop(seconds=30)
     async def auto_save(self):
-        if not self.is_production or not self.token:
-            return
+        ok = await self.flush()
+        interval = self.scheduler.plan(self.backend, len(self.dirty), self.pending_changes, ok)
+        if interval != self.auto_save.seconds:
+            self.auto_save.change_interval(seconds=interval)
+
+    async def flush(self):
+        """Write every dirty document to the backend; False if any of them failed (they stay dirty).
+
+        Documents in conflict stay dirty too, but only show up in flush_status().
+        """
+        if not self.dirty:
+            return True
+        if self.backend.rate_limit_wait():
+            return True  # not a failure, the scheduler waits out the Retry-After
         
-        if self.pending_saves:
-            print("💾 Auto-saving to GitHub...")
-            
-            if self.economy_cache:
-                success = self.save_to_github("economy.json", self.economy_cache, self.economy_sha)
-                if success:
-                    _, self.economy_sha = self.load_from_github("economy.json")
-            
-            if self.leaderboard_cache:
-                success = self.save_to_github("leaderboard.json", self.leaderboard_cache, self.leaderboard_sha)
-                if success:
-                    _, self.leaderboard_sha = self.load_from_github("leaderboard.json")
+        # Swapped out up front so saves made while we upload schedule another flush
+        dirty, self.dirty = self.dirty, set()
+        pending, self.pending_changes = self.pending_changes, 0
+        changed = {}
+        
+        # Every journal entry up to here is in the economy documents serialized below
+        covered = self.journal.seq if self.journal is not None else 0
+        try:
+            for path in sorted(dirty):
+                # Serialized here on the loop so the snapshot is consistent; the write itself is not
+                content = self.serialize(self.document(path))
+                if self.digest(content) != self.committed_digests.get(path):
+                    changed[path] = content
+            if not changed:
+                self.dirty_since = None if not self.dirty else self.dirty_since
+                if self.journal is not None:
+                    await self.journal.checkpoint(covered)
+                return True  # saved, but nothing actually changed
             
-            self.pending_saves = False
-            print("✅ Auto-save complete")
+            if self.backend.announce_flushes:
+                print(f"💾 Auto-saving to {self.backend.name}...")
+            # The manifest only moves to a new layout once every file of that layout is saved
+            manifest = changed.pop(ECONOMY_MANIFEST, None)
+            failures = await self.backend.save_many(changed) if changed else {}
+            if manifest is not None:
+                changed[ECONOMY_MANIFEST] = manifest
+                if any(path in failures for path in self.economy_paths()):
+                    failures[ECONOMY_MANIFEST] = StorageError(f"{ECONOMY_MANIFEST} waits for the economy files")
+                else:
+                    failures.update(await self.backend.save_many({ECONOMY_MANIFEST: manifest}))
+        except Exception as e:
+            # Unexpected (a malformed response, a bug): still never drop what we were saving
+            print(f"❌ Auto-save failed: {e!r}")
+            self.dirty |= dirty
+            self.pending_changes += pending
+            self.scheduler.last_error = repr(e)
+            return False
+        for path, content in changed.items():
+            if isinstance(failures.get(path), StorageConflict):
+                print(f"🚨 {failures[path]}")
+                self.conflicts[path] = str(failures[path])
+            elif path in failures:
+                print(f"❌ Could not save {path}: {failures[path]}")
+            else:
+                self.committed_digests[path] = self.digest(content)
+                self.conflicts.pop(path, None)
+        
+        self.dirty |= set(failures)
+        if failures:
+            self.pending_changes += pending
+            self.scheduler.last_error = str(next(iter(failures.values())))
+        elif not self.dirty:
+            self.dirty_since = None
+        saved = len(changed) - len(failures)
+        if saved and not failures and self.backend.announce_flushes:
+            print(f"✅ Auto-save complete ({saved} file{'s' if saved != 1 else ''})")
+        
+        if self.journal is not None:
+            if not any(path in failures for path in self.economy_paths() + [ECONOMY_MANIFEST]):
+                await self.journal.checkpoint(covered)
+            elif self.journal.entries_since_snapshot >= self.journal.COMPACT_AFTER_ENTRIES:
+                await self.journal.compact()
+                print("📒 Journal compacted")
+        # A conflict needs a person to resolve it, so it doesn't back off everyone else's flushes
+        return all(path in self.conflicts for path in failures)
+
+    @auto_save.after_loop
+    async def after_auto_save(self):
+        # Runs on stop/cancel too, so the pooled connections are always released
+        await self.backend.close()
+
+# ================= ECONOMY JOURNAL =================
+class EconomyJournal:
+    """Append-only log of account changes on local disk, replayed over the loaded economy at boot.
+
+    Every entry is one JSON line ``[seq, user_id, account]`` holding the account's full state, so
+    replaying is an idempotent upsert. Entries are group-committed: records made within
+    GROUP_COMMIT_SECONDS share one write + fsync. checkpoint() records the seq the backend's copy
+    of the economy covers. compact() then snapshots only the accounts changed after it and starts
+    a new segment, after which older segments are deleted.
+    """
+    GROUP_COMMIT_SECONDS = 0.05
+    COMPACT_AFTER_ENTRIES = 5000
+
+    def __init__(self, directory, snapshot_format="json"):
+        self.directory = directory
+        self.snapshot_format = snapshot_format
+        self.snapshot_path = os.path.join(directory, "economy.snapshot.json")
+        self.seq = 0
+        # Highest seq the backend has committed, and user id -> (seq, account) for changes after it
+        self.checkpoint_seq = 0
+        self.unflushed = {}
+        self.segment = 0
+        self.entries_since_snapshot = 0
+        self.buffer = []
+        self.file = None
+        self.commit_task = None
+        self.write_lock = None
+        os.makedirs(directory, exist_ok=True)
+
+    def segment_path(self, number):
+        return os.path.join(self.directory, f"economy.journal.{number:06d}")
+
+    def segments(self):
+        names = [n for n in os.listdir(self.directory) if n.startswith("economy.journal.")]
+        return sorted(int(n.rsplit(".", 1)[1]) for n in names)
+
+    def replay(self, economy):
+        """Apply the accounts changed after the last checkpoint to ``economy`` in place; returns their ids.
+
+        ``economy`` is what the backend loaded, which already holds everything up to the checkpoint,
+        so any other account (including one edited on the backend while we were down) is left alone.
+        """
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = decode_document(f.read())
+        except FileNotFoundError:
+            snapshot = {"seq": 0, "checkpoint": 0, "users": {}}
+        if "economy" in snapshot:
+            # Written before checkpoints existed: every account in it counts as changed
+            snapshot = {"seq": snapshot["seq"], "checkpoint": 0, "users": snapshot["economy"]["users"]}
+        
+        self.seq = snapshot_seq = snapshot["seq"]
+        self.checkpoint_seq = snapshot["checkpoint"]
+        self.unflushed = {user_id: (snapshot_seq, account) for user_id, account in snapshot["users"].items()}
+        applied = 0
+        segments = self.segments()
+        for number in segments:
+            with open(self.segment_path(number), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        seq, user_id, account = json.loads(line)
+                    except ValueError:
+                        break  # torn tail from a crash mid-write
+                    if seq > snapshot_seq:
+                        self.unflushed[user_id] = (seq, account)
+                        applied += 1
+                    self.seq = max(self.seq, seq)
+        
+        for user_id, (_, account) in self.unflushed.items():
+            economy["users"][user_id] = account
+        self.entries_since_snapshot = applied
+        self.segment = (segments[-1] + 1) if segments else 0
+        return set(self.unflushed)
+
+    def record(self, user_id, account):
+        """Queue one account's current state; it is durable after the next group commit"""
+        self.seq += 1
+        self.entries_since_snapshot += 1
+        self.unflushed[str(user_id)] = (self.seq, account)
+        self.buffer.append(json.dumps([self.seq, str(user_id), account], separators=(",", ":")) + "\n")
+        if self.commit_task is None or self.commit_task.done():
+            self.commit_task = asyncio.get_running_loop().create_task(self.group_commit())
+
+    async def group_commit(self):
+        await asyncio.sleep(self.GROUP_COMMIT_SECONDS)
+        await self.sync()
+
+    async def sync(self):
+        """Write and fsync everything recorded so far"""
+        if self.write_lock is None:
+            self.write_lock = asyncio.Lock()
+        async with self.write_lock:
+            if not self.buffer:
+                return
+            lines, self.buffer = self.buffer, []
+            if self.file is None:
+                self.file = open(self.segment_path(self.segment), "a", encoding="utf-8")
+            await asyncio.to_thread(self.write_lines, self.file, lines)
+
+    def write_lines(self, file, lines):
+        file.write("".join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+
+    async def checkpoint(self, seq):
+        """The backend has committed every change up to ``seq``: forget those and compact"""
+        if seq <= self.checkpoint_seq:
+            return
+        self.checkpoint_seq = seq
+        await self.compact()
+
+    async def compact(self):
+        """Snapshot the accounts changed since the checkpoint and drop the segments it covers.
+
+        The snapshot is built under the write lock in the same step that reads self.seq, so
+        records made while we wait for the lock are never left out.
+        """
+        await self.sync()
+        async with self.write_lock:
+            self.unflushed = {user_id: entry for user_id, entry in self.unflushed.items() if entry[0] > self.checkpoint_seq}
+            users = {user_id: account for user_id, (_, account) in self.unflushed.items()}
+            content = encode_document({"seq": self.seq, "checkpoint": self.checkpoint_seq, "users": users}, self.snapshot_format)
+            old_file, self.file = self.file, None
+            self.segment += 1
+            self.entries_since_snapshot = 0
+            await asyncio.to_thread(self.write_snapshot, content, old_file)
+
+    def write_snapshot(self, content, old_file):
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        if old_file is not None:
+            old_file.close()
+        for number in self.segments():
+            if number < self.segment:
+                os.remove(self.segment_path(number))
+
+    async def close(self):
+        await self.sync()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+# ================= SQLITE STORAGE =================
+class SQLiteStorage:
+    """Row-level alternative to the JSON documents (STORAGE_BACKEND=sqlite).
+
+    Accounts and monthly kills live in a WAL-mode database. Reads are still served from the
+    in-memory dicts the commands mutate; saves upsert only the rows that changed, straight away,
+    so there is nothing for auto_save to flush.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS accounts (
+            user_id    TEXT PRIMARY KEY,
+            balance    INTEGER NOT NULL,
+            total_won  INTEGER NOT NULL DEFAULT 0,
+            total_lost INTEGER NOT NULL DEFAULT 0,
+            last_daily INTEGER NOT NULL DEFAULT 0
+        );
+        -- The rich list is served from the in-memory AccountStore, so no balance index to maintain
+        DROP INDEX IF EXISTS accounts_by_balance;
+        CREATE TABLE IF NOT EXISTS kills (
+            month   TEXT NOT NULL,
+            player  TEXT NOT NULL,
+            regular INTEGER NOT NULL DEFAULT 0,
+            team    INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, player)
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mode_name = "SQLite"
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+        
+        print(f"🔧 Storage Mode: SQLite ({path})")
+        
+        if self.db.execute("SELECT COUNT(*) FROM accounts").fetchone()[0] == 0 and os.path.exists(ECON_FILE):
+            self.import_json(ECON_FILE, DATA_FILE)
+        
+        self.economy_cache = {"users": AccountStore({
+            user_id: {"balance": balance, "total_won": won, "total_lost": lost, "last_daily": last_daily}
+            for user_id, balance, won, lost, last_daily in self.db.execute("SELECT * FROM accounts")
+        })}
+        self.leaderboard_cache = {}
+        for month, player, regular, team in self.db.execute("SELECT * FROM kills"):
+            self.leaderboard_cache.setdefault(month, {})[player] = {"regular": regular, "team": team}
+        print(f"💰 Loaded {len(self.economy_cache['users'])} accounts, {len(self.leaderboard_cache)} months")
+
+    def upsert_accounts(self, users, user_ids):
+        # A last_daily of None (never claimed, e.g. from an imported economy.json) is stored as 0
+        rows = [
+            (user_id, users[user_id]["balance"], users[user_id]["total_won"],
+             users[user_id]["total_lost"], users[user_id]["last_daily"] or 0)
+            for user_id in user_ids
+        ]
+        self.db.execute("BEGIN")
+        self.db.executemany(
+            "INSERT INTO accounts VALUES (?, ?, ?, ?, ?) ON CONFLICT (user_id) DO UPDATE SET "
+            "balance = excluded.balance, total_won = excluded.total_won, "
+            "total_lost = excluded.total_lost, last_daily = excluded.last_daily",
+            rows
+        )
+        self.db.execute("COMMIT")
+
+    def replace_months(self, leaderboard, month_keys):
+        self.db.execute("BEGIN")
+        for month in month_keys:
+            self.db.execute("DELETE FROM kills WHERE month = ?", (month,))
+            self.db.executemany(
+                "INSERT INTO kills VALUES (?, ?, ?, ?)",
+                [(month, player, s.get("regular", 0), s.get("team", 0)) for player, s in leaderboard.get(month, {}).items()]
+            )
+        self.db.execute("COMMIT")
+
+    def get_economy(self):
+        return self.economy_cache
+
+    def save_economy(self, data, *user_ids):
+        self.economy_cache = data
+        self.upsert_accounts(data["users"], [str(u) for u in user_ids] or list(data["users"]))
+
+    def top_balances(self, limit, start=0):
+        """[(user_id, account)] of the richest accounts, from rank start+1"""
+        return self.economy_cache["users"].richest(start, limit)
+
+    def balance_rank(self, user_id):
+        return self.economy_cache["users"].rank(user_id)
+
+    def get_leaderboard(self):
+        return self.leaderboard_cache
+
+    def save_leaderboard(self, data, *month_keys):
+        self.leaderboard_cache = data
+        self.replace_months(data, month_keys or list(data))
+
+    def archived_months(self):
+        """Every month stays in the kills table, nothing is archived"""
+        return []
+
+    def archive_rollups(self):
+        return {}
+
+    def import_json(self, econ_path, lb_path):
+        """Replace the database contents with economy.json / leaderboard.json"""
+        with open(econ_path, "r", encoding="utf-8") as f:
+            users = decode_document(f.read()).get("users", {})
+        try:
+            with open(lb_path, "r", encoding="utf-8") as f:
+                leaderboard = decode_document(f.read())
+        except FileNotFoundError:
+            leaderboard = {}
+        
+        self.db.execute("DELETE FROM accounts")
+        self.upsert_accounts(users, list(users))
+        self.db.execute("DELETE FROM kills")
+        self.replace_months(leaderboard, list(leaderboard))
+        print(f"📥 Imported {len(users)} accounts and {len(leaderboard)} months into SQLite")
+
+    def export_json(self, econ_path, lb_path):
+        """Write the database back out in the economy.json / leaderboard.json layout (for backups)"""
+        # A separate connection reads a consistent WAL snapshot without blocking writers
+        reader = sqlite3.connect(self.path)
+        try:
+            users = {
+                user_id: {"balance": balance, "total_won": won, "total_lost": lost, "last_daily": last_daily}
+                for user_id, balance, won, lost, last_daily in reader.execute("SELECT * FROM accounts")
+            }
+            leaderboard = {}
+            for month, player, regular, team in reader.execute("SELECT * FROM kills ORDER BY month"):
+                leaderboard.setdefault(month, {})[player] = {"regular": regular, "team": team}
+        finally:
+            reader.close()
+        
+        with open(econ_path, "w", encoding="utf-8") as f:
+            json.dump({"users": users}, f, indent=4)
+        with open(lb_path, "w", encoding="utf-8") as f:
+            json.dump(leaderboard, f, indent=4)
+        print(f"📤 Exported {len(users)} accounts and {len(leaderboard)} months")
+
+    def flush_status(self):
+        return {"backend": self.mode_name, "interval_seconds": 0, "dirty_documents": [], "pending_changes": 0}
+
+    async def startup(self):
+        """Nothing to fetch, the caches were filled from the database in __init__"""
+
+    def start_auto_save(self):
+        print("🔄 SQLite writes are immediate, no auto-save needed")
+
+    async def shutdown(self):
+        self.db.close()
 
 # ================= CONFIG =================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ECON_FILE = os.path.join(BASE_DIR, "economy.json")
 DATA_FILE = os.path.join(BASE_DIR, "leaderboard.json")
+# Must be on a persistent disk in production for the journal to survive redeploys
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", os.path.join(BASE_DIR, "journal"))
+# "json" (GitHub in production, local files otherwise), "github", "local", "memory" or "sqlite"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(BASE_DIR, "png-bot.sqlite3"))
+GITHUB_REPO = "taesynreinhart1/png-bot"
+GITHUB_BRANCH = "main"
+# Point at github_standin.py to run the GitHub path offline
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+# The journal only covers account changes, and only survives a redeploy when JOURNAL_DIR is on a
+# persistent disk; rare, large GitHub flushes are the default only once it has been set up
+GITHUB_FLUSH_SECONDS = int(os.getenv("GITHUB_FLUSH_SECONDS", 300 if os.getenv("JOURNAL_DIR") else 30))
+# "contents" (one PUT/commit per file) or "tree" (all dirty files in one commit)
+GITHUB_COMMIT_MODE = os.getenv("GITHUB_COMMIT_MODE", "contents")
+# Split the economy over this many economy/shard-NN.json files (0 = one economy.json)
+ECONOMY_SHARDS = int(os.getenv("ECONOMY_SHARDS", 0))
+# Kill leaderboard seasons, e.g. "Winter=2025-12:2026-02,Spring=2026-03:2026-05" (inclusive months)
+KILL_SEASONS = {
+    name.strip(): tuple(span.split(":"))
+    for name, span in (entry.split("=", 1) for entry in os.getenv("KILL_SEASONS", "").split(",") if "=" in entry)
+}
+# How documents and journal snapshots are written: "json" (minified), "pretty" or "zlib".
+# Every format is read back regardless of this setting.
+STORAGE_FORMAT = os.getenv("STORAGE_FORMAT", "json")
+# Blackjack from a shared shoe of this many decks, reshuffled once BLACKJACK_PENETRATION of it
+# has been dealt (0 = a fresh single deck for every hand)
+BLACKJACK_DECKS = int(os.getenv("BLACKJACK_DECKS", 0))
+BLACKJACK_PENETRATION = float(os.getenv("BLACKJACK_PENETRATION", 0.75))
+# Seconds a channel's shared roulette table takes bets after the first one before it spins
+ROULETTE_BETTING_WINDOW = int(os.getenv("ROULETTE_BETTING_WINDOW", 20))
 
 START_BALANCE = 500
 MIN_BET = 10
@@ -211,14 +1465,32 @@ GUILD_ID = 1361851093004320908
 TOKEN = os.getenv("BOTTOKEN")
 AUTHORIZED_USERS = [1035911200237699072, 1252375690242818121]
 
-storage = GitHubStorage()
+def create_storage():
+    if STORAGE_BACKEND == "sqlite":
+        return SQLiteStorage(SQLITE_PATH)
+    if STORAGE_BACKEND == "memory":
+        return Storage(MemoryBackend(), economy_shards=ECONOMY_SHARDS, document_format=STORAGE_FORMAT)
+    
+    token = os.getenv("GITHUBTOKEN")
+    is_production = bool(os.environ.get('RENDER') or os.environ.get('RAILWAY') or os.environ.get('DYNO'))
+    if STORAGE_BACKEND == "github" or (STORAGE_BACKEND == "json" and is_production and token):
+        backend = GitHubBackend(
+            token, GITHUB_REPO, GITHUB_BRANCH, GITHUB_API_URL, GITHUB_FLUSH_SECONDS, GITHUB_COMMIT_MODE
+        )
+        journal = EconomyJournal(JOURNAL_DIR, STORAGE_FORMAT)
+        return Storage(backend, journal=journal, economy_shards=ECONOMY_SHARDS, document_format=STORAGE_FORMAT)
+    return Storage(LocalFileBackend(BASE_DIR), economy_shards=ECONOMY_SHARDS, document_format=STORAGE_FORMAT)
+
+storage = create_storage()
 
 # ================= HELPER FUNCTIONS =================
 def load_data():
     return storage.get_leaderboard()
 
-def save_data(data):
-    storage.save_leaderboard(data)
+def save_data(data, *month_keys, players=()):
+    """Save the leaderboard; name the months (and players) that changed to keep the kills index incremental"""
+    storage.save_leaderboard(data, *month_keys)
+    kills_index.refresh(data, month_keys, players)
 
 def get_month_key(month: str = None):
     return month if month else datetime.now().strftime("%Y-%m")
@@ -229,8 +1501,9 @@ def is_authorized(user_id):
 def load_economy():
     return storage.get_economy()
 
-def save_economy(data):
-    storage.save_economy(data)
+def save_economy(data, *user_ids):
+    """Save the economy; pass the ids of the accounts that changed so they get journaled"""
+    storage.save_economy(data, *user_ids)
 
 def get_account(user_id):
     data = load_economy()
@@ -243,14 +1516,413 @@ def get_account(user_id):
             "total_lost": 0,
             "last_daily": 0
         }
-        save_economy(data)
+        save_economy(data, user_id)
         print(f"🆕 Created account for {user_id}")
 
     return data, data["users"][user_id]
 
+# ================= LEDGER =================
+class InsufficientFunds(Exception):
+    """A debit would take an account below zero"""
+
+    def __init__(self, user_id, balance, amount):
+        super().__init__(f"{user_id} has {balance} PNG, needs {amount}")
+        self.user_id = str(user_id)
+        self.balance = balance
+        self.amount = amount
+
+
+class Ledger:
+    """Balance changes that check and apply in one step, serialized per account.
+
+    Accounts hash onto LOCK_STRIPES asyncio locks instead of sharing one global lock, so
+    different users never wait on each other. Operations touching two accounts take both
+    stripes in index order, which keeps concurrent transfers between the same pair from
+    deadlocking. Use hold() to keep accounts locked across awaits around several operations:
+    it is reentrant per task, so the operations inside skip the stripes already held. Name
+    every account they touch in the outer hold() so stripes are still taken in order.
+    """
+    LOCK_STRIPES = 64
+
+    def __init__(self):
+        self.locks = [asyncio.Lock() for _ in range(self.LOCK_STRIPES)]
+        self.owners = [None] * self.LOCK_STRIPES  # task holding each stripe
+
+    def stripe(self, user_id):
+        return zlib.crc32(str(user_id).encode()) % self.LOCK_STRIPES
+
+    @contextlib.asynccontextmanager
+    async def hold(self, *user_ids):
+        task = asyncio.current_task()
+        async with contextlib.AsyncExitStack() as stack:
+            for stripe in sorted({self.stripe(user_id) for user_id in user_ids}):
+                if self.owners[stripe] is task:
+                    continue  # held by an outer hold() in this task
+                await stack.enter_async_context(self.locks[stripe])
+                self.owners[stripe] = task
+                stack.callback(self.owners.__setitem__, stripe, None)
+            yield
+
+    def take(self, user_id, amount):
+        data, account = get_account(user_id)
+        if account["balance"] < amount:
+            raise InsufficientFunds(user_id, account["balance"], amount)
+        account["balance"] -= amount
+        return data, account
+
+    async def debit(self, user_id, amount, lost=0):
+        """Take ``amount`` (raises InsufficientFunds); returns the account"""
+        async with self.hold(user_id):
+            data, account = self.take(user_id, amount)
+            account["total_lost"] += lost
+            save_economy(data, user_id)
+            return account
+
+    async def credit(self, user_id, amount, won=0):
+        """Add ``amount``; returns the account"""
+        async with self.hold(user_id):
+            data, account = get_account(user_id)
+            account["balance"] += amount
+            account["total_won"] += won
+            save_economy(data, user_id)
+            return account
+
+    async def transfer(self, payer_id, payee_id, amount, wager=False):
+        """Move ``amount`` between two accounts atomically (raises InsufficientFunds).
+
+        With wager=True it also counts as a loss for the payer and a win for the payee.
+        Returns (payer account, payee account).
+        """
+        async with self.hold(payer_id, payee_id):
+            data, payer = self.take(payer_id, amount)
+            payee = get_account(payee_id)[1]
+            payee["balance"] += amount
+            if wager:
+                payer["total_lost"] += amount
+                payee["total_won"] += amount
+            save_economy(data, payer_id, payee_id)
+            return payer, payee
+
+    @staticmethod
+    def book(account, bet, payout):
+        account["balance"] += payout
+        if payout > bet:
+            account["total_won"] += payout - bet
+        elif payout < bet:
+            account["total_lost"] += bet - payout
+
+    async def settle_wager(self, user_id, bet, payout):
+        """Stake ``bet`` and pay back ``payout`` (0 on a loss, bet included on a win) in one step.
+
+        Raises InsufficientFunds if the stake isn't covered. The net result goes to
+        total_won/total_lost. Returns the account.
+        """
+        async with self.hold(user_id):
+            data, account = self.take(user_id, bet)
+            self.book(account, bet, payout)
+            save_economy(data, user_id)
+            return account
+
+ledger = Ledger()
+
+# ================= KILLS INDEX =================
+def kill_total(stats):
+    return stats.get("regular", 0) + stats.get("team", 0)
+
+
+class KillRanking:
+    """Players ordered by total kills, then name: one month, or a rollup of several"""
+
+    def __init__(self, totals=None):
+        self.totals = dict(totals or {})
+        self.order = SortedList((-total, player) for player, total in self.totals.items())
+
+    def set(self, player, total):
+        old = self.totals.get(player)
+        if old == total:
+            return
+        if old is not None:
+            self.order.remove((-old, player))
+        self.totals[player] = total
+        self.order.add((-total, player))
+
+    def discard(self, player):
+        old = self.totals.pop(player, None)
+        if old is not None:
+            self.order.remove((-old, player))
+
+    def __len__(self):
+        return len(self.totals)
+
+    def rank(self, player):
+        """1-based rank, shared by players on the same total; None if the player has no entry"""
+        total = self.totals.get(player)
+        if total is None:
+            return None
+        return self.order.bisect_left((-total,)) + 1
+
+    def page(self, start, count):
+        """[(rank, player, total)] for positions start+1 .. start+count"""
+        return [(self.order.bisect_left((neg_total,)) + 1, player, -neg_total)
+                for neg_total, player in self.order.islice(start, start + count)]
+
+
+MENTION_KEY = re.compile(r"<@!?(\d+)>")
+
+
+class PlayerNames:
+    """Every player key across all months, for autocomplete.
+
+    Keys are kept as (casefolded text, key) in a SortedList, so a prefix search is one
+    irange in O(log n + k). Mention keys like <@123> are also searchable by their id and,
+    once known, by the member's display name. Substring and then difflib close matches
+    fill in when prefixes come up short.
+    """
+
+    def __init__(self):
+        self.entries = SortedList()
+        self.keys = set()
+        self.aliases = {}  # mention key -> display name
+
+    def texts(self, key):
+        texts = {key.casefold()}
+        mention = MENTION_KEY.fullmatch(key)
+        if mention:
+            texts.add(mention.group(1))
+        if key in self.aliases:
+            texts.add(self.aliases[key].casefold())
+        return texts
+
+    def add(self, key):
+        if key not in self.keys:
+            self.keys.add(key)
+            self.entries.update((text, key) for text in self.texts(key))
+
+    def rebuild(self, keys):
+        self.keys = set(keys)
+        self.entries = SortedList((text, key) for key in self.keys for text in self.texts(key))
+
+    def set_alias(self, key, display_name):
+        if self.aliases.get(key) == display_name or key not in self.keys:
+            return
+        for text in self.texts(key):
+            self.entries.discard((text, key))
+        self.aliases[key] = display_name
+        self.entries.update((text, key) for text in self.texts(key))
+
+    def label(self, key):
+        return f"@{self.aliases[key]}" if key in self.aliases else key
+
+    def suggest(self, query, limit=25):
+        """Up to ``limit`` keys: prefix matches first, then substring, then fuzzy matches"""
+        query = query.strip().casefold()
+        found = []
+        for _, key in self.entries.irange((query,), (query + "\U0010ffff",)):
+            if key not in found:
+                found.append(key)
+                if len(found) == limit:
+                    return found
+        if query:
+            for text, key in self.entries:
+                if query in text and key not in found:
+                    found.append(key)
+                    if len(found) == limit:
+                        return found
+        if query and not found:
+            texts = {}
+            for text, key in self.entries:
+                texts.setdefault(text, key)
+            for text in difflib.get_close_matches(query, list(texts), n=limit, cutoff=0.6):
+                if texts[text] not in found:
+                    found.append(texts[text])
+        return found
+
+
+class KillsIndex:
+    """A KillRanking per month plus materialized rollups, kept in step with the leaderboard by save_data.
+
+    Rollups are keyed "all", "year:YYYY" and "season:NAME" (seasons are inclusive YYYY-MM
+    ranges). Adding kills applies the player's delta to each rollup covering the month in
+    O(log n), so an all-time or season page costs the same as a month page however much
+    history there is. Months that are reset or rebuilt have their rollups re-summed.
+    Legacy keys that aren't YYYY-MM only count towards "all". Archived months aren't ranked
+    here; their totals come in as the ``archived`` rollups that every rollup starts from.
+    """
+
+    def __init__(self, seasons=None):
+        self.seasons = seasons or {}
+        self.rankings = {}
+        self.archived = {}
+        self.names = PlayerNames()
+
+    def rollups(self, month_key):
+        keys = ["all"]
+        if len(month_key) == 7 and month_key[4] == "-":
+            keys.append(f"year:{month_key[:4]}")
+            keys += [f"season:{name}" for name, (first, last) in self.seasons.items() if first <= month_key <= last]
+        return keys
+
+    def months(self):
+        return [key for key in self.rankings if key != "all" and ":" not in key]
+
+    def contributions(self, months):
+        """{rollup key: {player: total}} that ``months`` ({month key: month data}) add up to"""
+        rollups = {}
+        for month_key, month in months.items():
+            for key in self.rollups(month_key):
+                rollup = rollups.setdefault(key, {})
+                for player, stats in month.items():
+                    rollup[player] = rollup.get(player, 0) + kill_total(stats)
+        return rollups
+
+    def rebuild(self, leaderboard, month_keys=None, archived=None):
+        """Re-rank these months (all of them by default), then re-sum the rollups they feed"""
+        if archived is not None:
+            self.archived = archived
+        stale = set(self.archived) if month_keys is None else set()
+        if month_keys is None:
+            self.rankings = {}
+            month_keys = list(leaderboard)
+        for month_key in month_keys:
+            month = leaderboard.get(month_key)
+            if month:
+                self.rankings[month_key] = KillRanking({player: kill_total(stats) for player, stats in month.items()})
+            else:
+                self.rankings.pop(month_key, None)
+        
+        stale |= {key for month_key in month_keys for key in self.rollups(month_key)}
+        for key in stale:
+            self.rankings.pop(key, None)
+        totals = {key: dict(self.archived.get(key, {})) for key in stale}
+        for month_key in self.months():
+            for key in self.rollups(month_key):
+                if key in totals:
+                    rollup = totals[key]
+                    for player, total in self.rankings[month_key].totals.items():
+                        rollup[player] = rollup.get(player, 0) + total
+        for key, rollup in totals.items():
+            if rollup:
+                self.rankings[key] = KillRanking(rollup)
+        self.names.rebuild(self.ranking("all").totals)
+
+    def refresh(self, leaderboard, month_keys, players):
+        """O(log n) per named player and ranking; months saved without players are rebuilt"""
+        if not month_keys:
+            self.rebuild(leaderboard)
+            return
+        if not players or any(player not in leaderboard.get(month_key, {}) for month_key in month_keys for player in players):
+            self.rebuild(leaderboard, month_keys)
+            return
+        for player in players:
+            self.names.add(player)
+        for month_key in month_keys:
+            month = self.rankings.setdefault(month_key, KillRanking())
+            for player in players:
+                total = kill_total(leaderboard[month_key][player])
+                delta = total - month.totals.get(player, 0)
+                month.set(player, total)
+                for key in self.rollups(month_key):
+                    rollup = self.rankings.setdefault(key, KillRanking())
+                    rollup.set(player, rollup.totals.get(player, 0) + delta)
+
+    def archive(self, month_keys, archived):
+        """These months moved to archives; their totals are now part of ``archived``"""
+        for month_key in month_keys:
+            self.rankings.pop(month_key, None)
+        self.archived = archived
+
+    def ranking(self, key):
+        return self.rankings.get(key) or KillRanking()
+
+    def month(self, month_key):
+        return self.ranking(month_key)
+
+    def years(self):
+        return sorted({key[5:] for key in self.rankings if key.startswith("year:")})
+
+kills_index = KillsIndex(KILL_SEASONS)
+
+# ================= LEADERBOARD ARCHIVE =================
+# Archived months kept parsed and ranked, least recently used first
+ARCHIVE_CACHE_MONTHS = 6
+archive_cache = OrderedDict()
+
+def season_spans():
+    return {name: list(span) for name, span in KILL_SEASONS.items()}
+
+async def load_month(month_key):
+    """(month data, KillRanking) of a live month, or of an archived one loaded on demand (raises StorageError)"""
+    data = load_data()
+    if month_key in data or month_key not in storage.archived_months():
+        return data.get(month_key, {}), kills_index.month(month_key)
+    if month_key in archive_cache:
+        archive_cache.move_to_end(month_key)
+        return archive_cache[month_key]
+    month = await storage.load_archived_month(month_key)
+    entry = archive_cache[month_key] = (month, KillRanking({player: kill_total(stats) for player, stats in month.items()}))
+    while len(archive_cache) > ARCHIVE_CACHE_MONTHS:
+        archive_cache.popitem(last=False)
+    return entry
+
+async def reopen_month(month_key):
+    """Make an archived month live again before writing to it (raises StorageError)"""
+    if month_key not in storage.archived_months():
+        return
+    month = await storage.load_archived_month(month_key)
+    storage.reopen_month(month_key, month, kills_index.contributions({month_key: month}))
+    archive_cache.pop(month_key, None)
+    kills_index.rebuild(load_data(), [month_key], archived=storage.archive_rollups())
+    print(f"🗄️ Reopened archived month {month_key}")
+
+async def archive_closed_months():
+    """Move every live month before the current one into its archive document"""
+    if isinstance(storage, SQLiteStorage):
+        return
+    current = get_month_key()
+    data = load_data()
+    closed = {month_key: data[month_key] for month_key in data if month_key < current}
+    if not closed:
+        return
+    try:
+        archived = await storage.archive_months(closed, kills_index.contributions, season_spans())
+    except StorageError as e:
+        print(f"❌ Archiving failed, months stay live: {e}")
+        return
+    kills_index.archive(archived, storage.archive_rollups())
+    print(f"🗄️ Archived {len(archived)} closed months: {', '.join(sorted(archived))}")
+    if len(archived) < len(closed):
+        print(f"🗄️ Edited while archiving, kept live: {', '.join(sorted(set(closed) - set(archived)))}")
+
+async def prepare_leaderboard():
+    """Boot: re-sum archive rollups if the seasons changed, archive closed months, build the kills index"""
+    if not isinstance(storage, SQLiteStorage) and storage.archived_months() and storage.archive_index["seasons"] != season_spans():
+        print("🗄️ Seasons changed, re-summing archive rollups...")
+        try:
+            months = storage.archived_months()
+            loaded = await asyncio.gather(*(storage.load_archived_month(month_key) for month_key in months))
+            storage.replace_archive_rollups(kills_index.contributions(dict(zip(months, loaded))), season_spans())
+        except StorageError as e:
+            print(f"❌ {e}")
+    kills_index.rebuild(load_data(), archived=storage.archive_rollups())
+    await archive_closed_months()
+
+@tasks.loop(hours=1)
+async def archive_leaderboard():
+    await archive_closed_months()
+
 # ================= BOT SETUP =================
 intents = discord.Intents.default()
-bot = commands.Bot(command_prefix="!", intents=intents)
+class PNGBot(commands.Bot):
+    async def setup_hook(self):
+        # Runs once, after login but before connecting to the gateway, on the bot's own loop
+        await storage.startup()
+        await prepare_leaderboard()
+        storage.start_auto_save()
+        archive_leaderboard.start()
+        cleanup_blackjack_games.start()
+        print("🃏 Blackjack cleanup started (5min)")
+
+bot = PNGBot(command_prefix="!", intents=intents)
 guild = discord.Object(id=GUILD_ID)
 
 # ================= EVENTS =================
@@ -258,27 +1930,8 @@ guild = discord.Object(id=GUILD_ID)
 async def on_ready():
     print(f"✅ Logged in as {bot.user}")
     
-    if storage.is_production and storage.token:
-        storage.auto_save.start()
-        print("🔄 Auto-save started (30s)")
-    
-    try:
-        synced = await bot.tree.sync(guild=guild)
-        print(f"🔄 Synced {len(synced)} commands")
-    except Exception as e:
-        print(f"❌ Sync failed: {e}")
-
-@bot.event
-async def on_ready():
-    print(f"✅ Logged in as {bot.user}")
-    
-    if storage.is_production and storage.token:
-        storage.auto_save.start()
-        print("🔄 Auto-save started (30s)")
-    
-    # Add this line:
-    cleanup_blackjack_games.start()
-    print("🃏 Blackjack cleanup started (5min)")
+    for key in list(kills_index.names.keys):
+        learn_display_name(bot.get_guild(GUILD_ID), key)
     
     try:
         synced = await bot.tree.sync(guild=guild)
@@ -298,18 +1951,83 @@ CARD_VALUES = {
 
 # Card suits
 SUITS = ['♠️', '♥️', '♦️', '♣️']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+# Cards are ints 0-51 (suit * 13 + rank); value and emoji text are looked up by card
+DECK = tuple(range(len(SUITS) * len(RANKS)))
+RANK_VALUES = tuple(CARD_VALUES[RANKS[card % 13]] for card in DECK)  # aces as 11
+CARD_NAMES = tuple(f"{RANKS[card % 13]}{SUITS[card // 13]}" for card in DECK)
+ACE = 11
 
 # Store active games
 ACTIVE_BLACKJACK_GAMES = {}
 
+class Hand:
+    """Cards plus a running score: aces count 11 until the hand would bust, then drop to 1"""
+    __slots__ = ("cards", "score", "soft_aces")
+
+    def __init__(self, cards=()):
+        self.cards = []
+        self.score = 0
+        self.soft_aces = 0  # aces still counted as 11
+        for card in cards:
+            self.add(card)
+
+    def add(self, card):
+        value = RANK_VALUES[card]
+        self.cards.append(card)
+        self.score += value
+        if value == ACE:
+            self.soft_aces += 1
+        while self.score > 21 and self.soft_aces:
+            self.score -= 10
+            self.soft_aces -= 1
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+class BlackjackShoe:
+    """``decks`` decks shuffled together and shared by every table. Once ``penetration`` of
+    the shoe has been dealt it is reshuffled before the next hand."""
+
+    def __init__(self, decks=6, penetration=0.75):
+        self.decks = decks
+        self.penetration = min(max(penetration, 0.1), 1.0)
+        self.cards = []
+        self.cut = 0
+        self.shuffle()
+
+    def shuffle(self):
+        self.cards = list(DECK) * self.decks
+        random.shuffle(self.cards)
+        # Dealing pops from the end, so the cut card sits this many cards from the front
+        self.cut = int(len(self.cards) * (1 - self.penetration))
+        print(f"🃏 Shuffled a {self.decks}-deck blackjack shoe")
+
+    def start_hand(self):
+        if len(self.cards) <= self.cut:
+            self.shuffle()
+
+    def draw(self):
+        if not self.cards:
+            self.shuffle()  # Only at 100% penetration with a hand in progress
+        return self.cards.pop()
+
 class BlackjackGame:
-    def __init__(self, player_id, bet_amount):
+    def __init__(self, player_id, bet_amount, shoe=None):
         self.player_id = str(player_id)
         self.bet_amount = bet_amount
-        self.deck = self.create_deck()
-        random.shuffle(self.deck)
-        self.player_hand = []
-        self.dealer_hand = []
+        # Without a shared shoe every game gets its own freshly shuffled deck
+        self.shoe = shoe
+        self.deck = None if shoe else self.create_deck()
+        self.player_hand = Hand()
+        self.dealer_hand = Hand()
         self.player_score = 0
         self.dealer_score = 0
         self.game_over = False
@@ -319,57 +2037,36 @@ class BlackjackGame:
         self.blackjack = False
         
     def create_deck(self):
-        """Create a standard 52-card deck"""
-        deck = []
-        for suit in SUITS:
-            for card in ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']:
-                deck.append(f"{card}{suit}")
+        """A shuffled 52-card deck"""
+        deck = list(DECK)
+        random.shuffle(deck)
         return deck
     
-    def get_card_value(self, card):
-        """Extract card value correctly (handles 10 properly)"""
-        if card.startswith('10'):
-            return '10'
-        else:
-            return card[0]  # First character: 'J', 'Q', 'K', 'A', '2'-'9'
-    
-    def calculate_score(self, hand):
-        """Calculate hand score with proper Ace handling"""
-        score = 0
-        aces = 0
-        
-        for card in hand:
-            value = self.get_card_value(card)
-            if value == 'A':
-                aces += 1
-                score += 11
-            else:
-                score += CARD_VALUES[value]
-        
-        # Adjust aces from 11 to 1 if needed
-        while score > 21 and aces > 0:
-            score -= 10
-            aces -= 1
-            
-        return score
+    @property
+    def dealer_up_score(self):
+        """Value of the dealer's face-up card (the first one is the hole card)"""
+        return RANK_VALUES[self.dealer_hand[1]]
     
     def deal_card(self, hand):
         """Deal a card to a hand"""
-        card = self.deck.pop()
-        hand.append(card)
+        card = self.shoe.draw() if self.shoe else self.deck.pop()
+        hand.add(card)
         return card
     
     def start_game(self):
         """Start a new blackjack game"""
+        if self.shoe:
+            self.shoe.start_hand()
+
         # Deal initial cards
         self.deal_card(self.player_hand)
         self.deal_card(self.dealer_hand)
         self.deal_card(self.player_hand)
         self.deal_card(self.dealer_hand)
         
-        # Calculate scores
-        self.player_score = self.calculate_score(self.player_hand)
-        self.dealer_score = self.calculate_score([self.dealer_hand[0]])
+        # Scores
+        self.player_score = self.player_hand.score
+        self.dealer_score = self.dealer_up_score
         
         # Check for player blackjack
         if self.player_score == 21:
@@ -382,7 +2079,7 @@ class BlackjackGame:
             return False
         
         self.deal_card(self.player_hand)
-        self.player_score = self.calculate_score(self.player_hand)
+        self.player_score = self.player_hand.score
         
         if self.player_score > 21:
             self.game_over = True
@@ -398,13 +2095,10 @@ class BlackjackGame:
         if self.game_over:
             return
         
-        # Reveal dealer's full hand
-        self.dealer_score = self.calculate_score(self.dealer_hand)
-        
         # Dealer draws to 17 or higher
-        while self.dealer_score < 17:
+        while self.dealer_hand.score < 17:
             self.deal_card(self.dealer_hand)
-            self.dealer_score = self.calculate_score(self.dealer_hand)
+        self.dealer_score = self.dealer_hand.score
         
         self.game_over = True
         
@@ -431,8 +2125,8 @@ class BlackjackGame:
     def format_hand(self, hand, hide_first=False):
         """Format hand for display"""
         if hide_first and len(hand) > 0:
-            return "?? " + " ".join(hand[1:])
-        return " ".join(hand)
+            return "?? " + " ".join(CARD_NAMES[card] for card in hand.cards[1:])
+        return " ".join(CARD_NAMES[card] for card in hand)
     
     def get_score_display(self, score, is_bust=False):
         """Get score with emoji"""
@@ -442,6 +2136,8 @@ class BlackjackGame:
             return f"🎯 **{score}**"
         return f"**{score}**"
 
+blackjack_shoe = BlackjackShoe(BLACKJACK_DECKS, BLACKJACK_PENETRATION) if BLACKJACK_DECKS else None
+
 class BlackjackBetModal(Modal, title="💰 Place Your Blackjack Bet"):
     def __init__(self):
         super().__init__()
@@ -462,21 +2158,18 @@ class BlackjackBetModal(Modal, title="💰 Place Your Blackjack Bet"):
                 )
                 return
             
-            # Check balance
-            data, account = get_account(interaction.user.id)
-            if account["balance"] < bet_amount:
+            # Deduct bet
+            try:
+                account = await ledger.debit(interaction.user.id, bet_amount)
+            except InsufficientFunds as e:
                 await interaction.response.send_message(
-                    f"❌ You only have {account['balance']} PNG!",
+                    f"❌ You only have {e.balance} PNG!",
                     ephemeral=True
                 )
                 return
             
-            # Deduct bet
-            account["balance"] -= bet_amount
-            save_economy(data)
-            
             # Create and start game
-            game = BlackjackGame(interaction.user.id, bet_amount)
+            game = BlackjackGame(interaction.user.id, bet_amount, blackjack_shoe)
             game.start_game()
             
             # Store game
@@ -504,7 +2197,7 @@ class BlackjackBetModal(Modal, title="💰 Place Your Blackjack Bet"):
             
             # Dealer hand (hidden)
             dealer_display = game.format_hand(game.dealer_hand, hide_first=True)
-            visible_score = game.calculate_score([game.dealer_hand[0]])
+            visible_score = game.dealer_up_score
             embed.add_field(
                 name=f"🤵 **DEALER** **{visible_score}** + ?",
                 value=f"```\n{dealer_display}\n```",
@@ -546,8 +2239,7 @@ class BlackjackGameView(View):
             
             # Add winnings to balance
             if self.game.payout > 0:
-                account["balance"] += self.game.payout
-                save_economy(data)
+                account = await ledger.credit(self.game.player_id, self.game.payout)
             
             # Player info
             embed.add_field(name="👤 Player", value=interaction.user.mention, inline=True)
@@ -615,7 +2307,7 @@ class BlackjackGameView(View):
             
             # Dealer hand (hidden)
             dealer_display = self.game.format_hand(self.game.dealer_hand, hide_first=True)
-            visible_score = self.game.calculate_score([self.game.dealer_hand[0]])
+            visible_score = self.game.dealer_up_score
             embed.add_field(
                 name=f"🤵 **DEALER** **{visible_score}** + ?",
                 value=f"```\n{dealer_display}\n```",
@@ -712,7 +2404,8 @@ async def blackjack(interaction: discord.Interaction):
     embed.add_field(name="💰 Balance", value=f"{account['balance']} PNG", inline=True)
     embed.add_field(
         name="📋 Rules", 
-        value="• Get as close to 21 as possible\n• Dealer stands on 17\n• Blackjack pays 3:2\n• Aces count as 1 or 11",
+        value="• Get as close to 21 as possible\n• Dealer stands on 17\n• Blackjack pays 3:2\n• Aces count as 1 or 11"
+              + (f"\n• Dealt from a {BLACKJACK_DECKS}-deck shoe" if blackjack_shoe else ""),
         inline=False
     )
     
@@ -758,7 +2451,7 @@ async def daily(interaction: discord.Interaction):
 
     account["balance"] += DAILY_REWARD
     account["last_daily"] = now
-    save_economy(data)
+    save_economy(data, interaction.user.id)
 
     await interaction.followup.send(f"🎁 {interaction.user.mention} received {DAILY_REWARD} PNG!")
 
@@ -777,29 +2470,24 @@ async def coinflip(interaction: discord.Interaction, bet: int, choice: str):
         await interaction.followup.send("Invalid bet amount.", ephemeral=True)
         return
 
-    data, account = get_account(interaction.user.id)
+    result = "heads" if random.random() < 0.48 else "tails"
 
-    if account["balance"] < bet:
+    try:
+        await ledger.settle_wager(interaction.user.id, bet, bet * 2 if choice == result else 0)
+    except InsufficientFunds:
         await interaction.followup.send("Not enough balance.", ephemeral=True)
         return
 
-    result = "heads" if random.random() < 0.48 else "tails"
-
     embed = discord.Embed(title="🪙 Coinflip", color=discord.Color.blue())
     embed.add_field(name="Player", value=interaction.user.mention)
     embed.add_field(name="Choice", value=choice)
     embed.add_field(name="Result", value=result)
 
     if choice == result:
-        account["balance"] += bet
-        account["total_won"] += bet
         embed.add_field(name="Outcome", value=f"💰 Won {bet} PNG!")
     else:
-        account["balance"] -= bet
-        account["total_lost"] += bet
         embed.add_field(name="Outcome", value=f"💸 Lost {bet} PNG.")
 
-    save_economy(data)
     await interaction.followup.send(embed=embed)
 
 # ================= DICE =================
@@ -811,33 +2499,28 @@ async def dice(interaction: discord.Interaction, bet: int):
         await interaction.followup.send("Invalid bet.", ephemeral=True)
         return
 
-    data, account = get_account(interaction.user.id)
-
-    if account["balance"] < bet:
-        await interaction.followup.send("Not enough balance.", ephemeral=True)
-        return
-
     user_roll = random.randint(1, 6)
     bot_roll = random.randint(1, 6)
 
     if user_roll == bot_roll:
         bot_roll = random.randint(1, 6)
 
+    try:
+        await ledger.settle_wager(interaction.user.id, bet, bet * 2 if user_roll > bot_roll else 0)
+    except InsufficientFunds:
+        await interaction.followup.send("Not enough balance.", ephemeral=True)
+        return
+
     embed = discord.Embed(title="🎲 Dice", color=discord.Color.purple())
     embed.add_field(name="Player", value=interaction.user.mention)
     embed.add_field(name="Your Roll", value=user_roll)
     embed.add_field(name="Bot Roll", value=bot_roll)
 
     if user_roll > bot_roll:
-        account["balance"] += bet
-        account["total_won"] += bet
         embed.add_field(name="Outcome", value=f"💰 Won {bet} PNG!")
     else:
-        account["balance"] -= bet
-        account["total_lost"] += bet
         embed.add_field(name="Outcome", value=f"💸 Lost {bet} PNG.")
 
-    save_economy(data)
     await interaction.followup.send(embed=embed)
 
 # ================= DICE VS PLAYER =================
@@ -857,14 +2540,11 @@ async def dicevs(interaction: discord.Interaction, opponent: discord.Member, bet
         await interaction.followup.send("Invalid bet.", ephemeral=True)
         return
 
-    challenger_data, challenger_account = get_account(interaction.user.id)
-    opponent_data, opponent_account = get_account(opponent.id)
-
-    if challenger_account["balance"] < bet:
+    if get_account(interaction.user.id)[1]["balance"] < bet:
         await interaction.followup.send("You don't have enough.", ephemeral=True)
         return
 
-    if opponent_account["balance"] < bet:
+    if get_account(opponent.id)[1]["balance"] < bet:
         await interaction.followup.send(f"{opponent.mention} doesn't have enough.", ephemeral=True)
         return
 
@@ -875,25 +2555,19 @@ async def dicevs(interaction: discord.Interaction, opponent: discord.Member, bet
     embed.add_field(name=interaction.user.display_name, value=f"Rolled: {challenger_roll}", inline=True)
     embed.add_field(name=opponent.display_name, value=f"Rolled: {opponent_roll}", inline=True)
 
-    if challenger_roll > opponent_roll:
-        challenger_account["balance"] += bet
-        opponent_account["balance"] -= bet
-        challenger_account["total_won"] += bet
-        opponent_account["total_lost"] += bet
-        embed.add_field(name="Winner", value=f"🏆 {interaction.user.mention}", inline=False)
-    elif opponent_roll > challenger_roll:
-        opponent_account["balance"] += bet
-        challenger_account["balance"] -= bet
-        opponent_account["total_won"] += bet
-        challenger_account["total_lost"] += bet
-        embed.add_field(name="Winner", value=f"🏆 {opponent.mention}", inline=False)
-    else:
-        embed.add_field(name="Result", value="🤝 Tie! No coins exchanged.", inline=False)
-
-    data = load_economy()
-    data["users"][str(interaction.user.id)] = challenger_account
-    data["users"][str(opponent.id)] = opponent_account
-    save_economy(data)
+    try:
+        if challenger_roll > opponent_roll:
+            await ledger.transfer(opponent.id, interaction.user.id, bet, wager=True)
+            embed.add_field(name="Winner", value=f"🏆 {interaction.user.mention}", inline=False)
+        elif opponent_roll > challenger_roll:
+            await ledger.transfer(interaction.user.id, opponent.id, bet, wager=True)
+            embed.add_field(name="Winner", value=f"🏆 {opponent.mention}", inline=False)
+        else:
+            embed.add_field(name="Result", value="🤝 Tie! No coins exchanged.", inline=False)
+    except InsufficientFunds as e:
+        # The transfer re-checks the stake under the account locks
+        await interaction.followup.send(f"<@{e.user_id}> doesn't have enough anymore.", ephemeral=True)
+        return
 
     await interaction.followup.send(embed=embed)
 
@@ -906,35 +2580,33 @@ async def slots(interaction: discord.Interaction, bet: int):
         await interaction.followup.send("Invalid bet.", ephemeral=True)
         return
 
-    data, account = get_account(interaction.user.id)
+    symbols = ["🍒", "🍋", "🔔", "💎", "7️⃣"]
+    result = [random.choice(symbols) for _ in range(3)]
 
-    if account["balance"] < bet:
+    if result.count(result[0]) == 3:
+        winnings = bet * 5
+    elif len(set(result)) == 2:
+        winnings = bet * 2
+    else:
+        winnings = 0
+
+    try:
+        await ledger.settle_wager(interaction.user.id, bet, bet + winnings if winnings else 0)
+    except InsufficientFunds:
         await interaction.followup.send("Not enough balance.", ephemeral=True)
         return
 
-    symbols = ["🍒", "🍋", "🔔", "💎", "7️⃣"]
-    result = [random.choice(symbols) for _ in range(3)]
-
     embed = discord.Embed(title="🎰 PNG Slots", color=discord.Color.orange())
     embed.add_field(name="Player", value=interaction.user.mention)
     embed.add_field(name="Result", value=" | ".join(result))
 
     if result.count(result[0]) == 3:
-        winnings = bet * 5
-        account["balance"] += winnings
-        account["total_won"] += winnings
         embed.add_field(name="JACKPOT!", value=f"💰 Won {winnings} PNG!")
-    elif len(set(result)) == 2:
-        winnings = bet * 2
-        account["balance"] += winnings
-        account["total_won"] += winnings
+    elif winnings:
         embed.add_field(name="Nice!", value=f"💰 Won {winnings} PNG!")
     else:
-        account["balance"] -= bet
-        account["total_lost"] += bet
         embed.add_field(name="Outcome", value=f"💸 Lost {bet} PNG.")
 
-    save_economy(data)
     await interaction.followup.send(embed=embed)
 
 # ================= ROULETTE =================
@@ -948,46 +2620,51 @@ BET_TYPES = {
     "column": 2, "dozen": 2, "red_black": 1, "even_odd": 1, "low_high": 1
 }
 
+# Wheel results are always these strings, so "0" and "00" compare the same way everywhere
+ROULETTE_NUMBERS = tuple(str(n) for n in range(37)) + ("00",)
+POCKET_COLORS = {
+    pocket: "green" if pocket in ("0", "00") else "red" if int(pocket) in RED_NUMBERS else "black"
+    for pocket in ROULETTE_NUMBERS
+}
+
 def check_color(number):
-    if number in RED_NUMBERS:
-        return "red"
-    elif number in [0, "00"]:
-        return "green"
-    else:
-        return "black"
+    return POCKET_COLORS[str(number)]
+
+NUMBER_EMOJI = {
+    0: "0️⃣", 1: "1️⃣", 2: "2️⃣", 3: "3️⃣", 4: "4️⃣", 5: "5️⃣", 6: "6️⃣", 7: "7️⃣", 8: "8️⃣", 9: "9️⃣",
+    10: "🔟", 11: "1️⃣1️⃣", 12: "1️⃣2️⃣", 13: "1️⃣3️⃣", 14: "1️⃣4️⃣", 15: "1️⃣5️⃣", 16: "1️⃣6️⃣",
+    17: "1️⃣7️⃣", 18: "1️⃣8️⃣", 19: "1️⃣9️⃣", 20: "2️⃣0️⃣", 21: "2️⃣1️⃣", 22: "2️⃣2️⃣", 23: "2️⃣3️⃣",
+    24: "2️⃣4️⃣", 25: "2️⃣5️⃣", 26: "2️⃣6️⃣", 27: "2️⃣7️⃣", 28: "2️⃣8️⃣", 29: "2️⃣9️⃣", 30: "3️⃣0️⃣",
+    31: "3️⃣1️⃣", 32: "3️⃣2️⃣", 33: "3️⃣3️⃣", 34: "3️⃣4️⃣", 35: "3️⃣5️⃣", 36: "3️⃣6️⃣", "00": "0️⃣0️⃣"
+}
+
+# Wheel layout with correct colors, in pocket order
+WHEEL_SEGMENTS = (
+    ("0", "🟢"), ("32", "🔴"), ("15", "⚫"), ("19", "🔴"), ("4", "⚫"), ("21", "🔴"), ("2", "⚫"), ("25", "🔴"), ("17", "⚫"), ("34", "🔴"),
+    ("6", "⚫"), ("27", "🔴"), ("13", "⚫"), ("36", "🔴"), ("11", "⚫"), ("30", "🔴"), ("8", "⚫"), ("23", "🔴"), ("10", "⚫"), ("5", "🔴"),
+    ("24", "⚫"), ("16", "🔴"), ("33", "⚫"), ("1", "🔴"), ("20", "⚫"), ("14", "🔴"), ("31", "⚫"), ("9", "🔴"), ("22", "⚫"), ("18", "🔴"),
+    ("29", "⚫"), ("7", "🔴"), ("28", "⚫"), ("12", "🔴"), ("35", "⚫"), ("3", "🔴"), ("26", "⚫"), ("00", "🟢")
+)
+
+ROULETTE_TABLES = {}  # channel id -> RouletteTable
+SPIN_FRAMES = 12
+SPIN_STEP = 3  # pockets the ball moves per frame
 
 def number_to_emoji(num):
     """Convert number to emoji"""
-    emoji_map = {
-        0: "0️⃣", 1: "1️⃣", 2: "2️⃣", 3: "3️⃣", 4: "4️⃣", 5: "5️⃣", 6: "6️⃣", 7: "7️⃣", 8: "8️⃣", 9: "9️⃣",
-        10: "🔟", 11: "1️⃣1️⃣", 12: "1️⃣2️⃣", 13: "1️⃣3️⃣", 14: "1️⃣4️⃣", 15: "1️⃣5️⃣", 16: "1️⃣6️⃣",
-        17: "1️⃣7️⃣", 18: "1️⃣8️⃣", 19: "1️⃣9️⃣", 20: "2️⃣0️⃣", 21: "2️⃣1️⃣", 22: "2️⃣2️⃣", 23: "2️⃣3️⃣",
-        24: "2️⃣4️⃣", 25: "2️⃣5️⃣", 26: "2️⃣6️⃣", 27: "2️⃣7️⃣", 28: "2️⃣8️⃣", 29: "2️⃣9️⃣", 30: "3️⃣0️⃣",
-        31: "3️⃣1️⃣", 32: "3️⃣2️⃣", 33: "3️⃣3️⃣", 34: "3️⃣4️⃣", 35: "3️⃣5️⃣", 36: "3️⃣6️⃣", "00": "0️⃣0️⃣"
-    }
-    return emoji_map.get(num, str(num))
-
-def create_spinner_animation(ball_position):
-    """Create a roulette wheel spinner with ball at specific position"""
-    
-    # Define the wheel layout with correct colors
-    wheel_segments = [
-        ("0", "🟢"), ("32", "🔴"), ("15", "⚫"), ("19", "🔴"), ("4", "⚫"), ("21", "🔴"), ("2", "⚫"), ("25", "🔴"), ("17", "⚫"), ("34", "🔴"),
-        ("6", "⚫"), ("27", "🔴"), ("13", "⚫"), ("36", "🔴"), ("11", "⚫"), ("30", "🔴"), ("8", "⚫"), ("23", "🔴"), ("10", "⚫"), ("5", "🔴"),
-        ("24", "⚫"), ("16", "🔴"), ("33", "⚫"), ("1", "🔴"), ("20", "⚫"), ("14", "🔴"), ("31", "⚫"), ("9", "🔴"), ("22", "⚫"), ("18", "🔴"),
-        ("29", "⚫"), ("7", "🔴"), ("28", "⚫"), ("12", "🔴"), ("35", "⚫"), ("3", "🔴"), ("26", "⚫"), ("00", "🟢")
-    ]
-    
-    # Create a visual wheel with ball at current position
+    return NUMBER_EMOJI.get(num, str(num))
+
+def render_wheel(ball_position):
+    """Draw the wheel with the ball on one pocket"""
     wheel = []
-    for i, (num, color) in enumerate(wheel_segments):
-        if i == ball_position % len(wheel_segments):
+    for i, (num, color) in enumerate(WHEEL_SEGMENTS):
+        if i == ball_position:
             wheel.append(f"⚪{number_to_emoji(num)}{color}")  # White ball on this segment
         else:
             wheel.append(f"  {number_to_emoji(num)}{color}")
     
     # Arrange in a circle (visual representation)
-    circle = (
+    return (
         f"```\n"
         f"        {wheel[0]}  {wheel[1]}  {wheel[2]}  {wheel[3]}        \n"
         f"    {wheel[4]}  {wheel[5]}  {wheel[6]}  {wheel[7]}  {wheel[8]}    \n"
@@ -998,62 +2675,120 @@ def create_spinner_animation(ball_position):
         f"            {wheel[28]}  {wheel[29]}  {wheel[30]}            \n"
         f"```"
     )
-    return circle
 
-def create_roulette_table(result, color):
-    """Create a visual roulette table with the result highlighted"""
-    
+def spin_status(frame):
+    if frame < 4:
+        return "**🏀 Ball is spinning...**"
+    elif frame < 8:
+        return "**🏀⚡ Ball is spinning faster...**"
+    return "**🏀🎯 Ball is slowing down...**"
+
+# Every ball position is drawn once here; a spin only indexes into these
+WHEEL_FRAMES = tuple(render_wheel(position) for position in range(len(WHEEL_SEGMENTS)))
+SPIN_ANIMATION = tuple(f"{WHEEL_FRAMES[i * SPIN_STEP % len(WHEEL_FRAMES)]}\n\n{spin_status(i)}" for i in range(SPIN_FRAMES))
+
+def render_table_columns():
+    """The three number rows of the table; only the result cell above them changes between spins"""
     # Define the roulette layout with correct column arrangement
-    col1 = ["3", "6", "9", "12", "15", "18", "21", "24", "27", "30", "33", "36"]
-    col2 = ["2", "5", "8", "11", "14", "17", "20", "23", "26", "29", "32", "35"]
-    col3 = ["1", "4", "7", "10", "13", "16", "19", "22", "25", "28", "31", "34"]
-    
-    # Format each column with colors
-    col1_display = []
-    for n in col1:
-        num = int(n)
-        color_emoji = "🔴" if num in RED_NUMBERS else "⚫"
-        col1_display.append(f"{number_to_emoji(num)}{color_emoji}")
-    
-    col2_display = []
-    for n in col2:
-        num = int(n)
-        color_emoji = "🔴" if num in RED_NUMBERS else "⚫"
-        col2_display.append(f"{number_to_emoji(num)}{color_emoji}")
-    
-    col3_display = []
-    for n in col3:
-        num = int(n)
-        color_emoji = "🔴" if num in RED_NUMBERS else "⚫"
-        col3_display.append(f"{number_to_emoji(num)}{color_emoji}")
-    
-    # Result display
-    if result in [0, "00"]:
-        result_display = f"{number_to_emoji(result)} 🟢"
-    else:
-        color_emoji = "🔴" if color == "red" else "⚫"
-        result_display = f"{number_to_emoji(int(result))} {color_emoji}"
-    
-    # Build the table
-    table = (
-        f"╔════════════════════════════════════════════════════════════╗\n"
-        f"║                       🎯 **RESULT** 🎯                      ║\n"
-        f"║                                                           ║\n"
-        f"║                    **{result_display}**                      ║\n"
-        f"║                                                           ║\n"
-        f"╠════════════════════════════════════════════════════════════╣\n"
-        f"║  COL 1          COL 2          COL 3                      ║\n"
-        f"║  {' '.join(col1_display[:6])}  ║\n"
-        f"║  {' '.join(col1_display[6:])}  ║\n"
-        f"║  {' '.join(col2_display[:6])}  ║\n"
-        f"║  {' '.join(col2_display[6:])}  ║\n"
-        f"║  {' '.join(col3_display[:6])}  ║\n"
-        f"║  {' '.join(col3_display[6:])}  ║\n"
-        f"║                                                           ║\n"
-        f"║                    0️⃣        🟢        0️⃣0️⃣                ║\n"
-        f"╚════════════════════════════════════════════════════════════╝"
+    columns = (
+        (3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36),
+        (2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 32, 35),
+        (1, 4, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34),
     )
-    return table
+    lines = []
+    for column in columns:
+        cells = [f"{NUMBER_EMOJI[n]}{'🔴' if n in RED_NUMBERS else '⚫'}" for n in column]
+        lines.append(f"║  {' '.join(cells[:6])}  ║\n")
+        lines.append(f"║  {' '.join(cells[6:])}  ║\n")
+    return "".join(lines)
+
+ROULETTE_TABLE_TOP = (
+    "╔════════════════════════════════════════════════════════════╗\n"
+    "║                       🎯 **RESULT** 🎯                      ║\n"
+    "║                                                           ║\n"
+    "║                    **"
+)
+ROULETTE_TABLE_BOTTOM = (
+    "**                      ║\n"
+    "║                                                           ║\n"
+    "╠════════════════════════════════════════════════════════════╣\n"
+    "║  COL 1          COL 2          COL 3                      ║\n"
+    + render_table_columns() +
+    "║                                                           ║\n"
+    "║                    0️⃣        🟢        0️⃣0️⃣                ║\n"
+    "╚════════════════════════════════════════════════════════════╝"
+)
+RESULT_CELLS = {
+    str(num): f"{emoji} {'🟢' if num in (0, '00') else '🔴' if num in RED_NUMBERS else '⚫'}"
+    for num, emoji in NUMBER_EMOJI.items()
+}
+
+def create_roulette_table(result):
+    """Create a visual roulette table with the result highlighted"""
+    return ROULETTE_TABLE_TOP + RESULT_CELLS[str(result)] + ROULETTE_TABLE_BOTTOM
+
+def bet_label(bet_type, bet_choice):
+    """e.g. "Red Black (red)" or "Split (5, 8)" """
+    choice = ", ".join(bet_choice) if isinstance(bet_choice, list) else bet_choice
+    return f"{bet_type.replace('_', ' ').title()} ({choice})"
+
+def pockets_where(condition):
+    return frozenset(p for p in ROULETTE_NUMBERS if p not in ("0", "00") and condition(int(p)))
+
+# Every outside bet's winning pockets, worked out once; 0 and 00 lose them all
+WINNING_SETS = {
+    ("red_black", "red"): pockets_where(lambda n: n in RED_NUMBERS),
+    ("red_black", "black"): pockets_where(lambda n: n not in RED_NUMBERS),
+    ("even_odd", "even"): pockets_where(lambda n: n % 2 == 0),
+    ("even_odd", "odd"): pockets_where(lambda n: n % 2 == 1),
+    ("low_high", "low"): pockets_where(lambda n: n <= 18),
+    ("low_high", "high"): pockets_where(lambda n: n >= 19),
+    ("dozen", "1st"): pockets_where(lambda n: n <= 12),
+    ("dozen", "2nd"): pockets_where(lambda n: 13 <= n <= 24),
+    ("dozen", "3rd"): pockets_where(lambda n: n >= 25),
+    ("column", "1st"): pockets_where(lambda n: n % 3 == 1),
+    ("column", "2nd"): pockets_where(lambda n: n % 3 == 2),
+    ("column", "3rd"): pockets_where(lambda n: n % 3 == 0),
+}
+INSIDE_BET_SIZES = {"single": 1, "split": 2, "street": 3, "corner": 4, "six_line": 6}
+MAX_SLIP_BETS = 15
+
+class RouletteBet:
+    """One bet on a slip. Its winning pockets are resolved when it's placed, so settling it
+    against a result is a single set lookup."""
+    __slots__ = ("bet_type", "choice", "amount", "pockets", "multiplier")
+
+    def __init__(self, bet_type, choice, amount):
+        if bet_type in INSIDE_BET_SIZES:
+            pockets = frozenset(choice)  # choice is a list of number strings
+            unknown = sorted(pockets - POCKET_COLORS.keys())
+            if unknown:
+                raise ValueError(f"There's no {', '.join(unknown)} on the wheel")
+            if len(pockets) != INSIDE_BET_SIZES[bet_type]:
+                raise ValueError(f"{bet_type} needs {INSIDE_BET_SIZES[bet_type]} different numbers")
+        else:
+            pockets = WINNING_SETS[bet_type, choice.lower()]
+        self.bet_type = bet_type
+        self.choice = choice
+        self.amount = amount
+        self.pockets = pockets
+        self.multiplier = BET_TYPES[bet_type]
+
+    def payout(self, result):
+        """What comes back for ``result``: the stake plus winnings, or 0"""
+        return self.amount * (self.multiplier + 1) if result in self.pockets else 0
+
+    def label(self):
+        return bet_label(self.bet_type, self.choice)
+
+def slip_lines(bets, result):
+    """One line per bet with what it did on ``result``"""
+    lines = []
+    for bet in bets:
+        payout = bet.payout(result)
+        outcome = f"🎉 +{payout - bet.amount}" if payout else f"💀 -{bet.amount}"
+        lines.append(f"{bet.amount} PNG on {bet.label()} → {outcome}")
+    return lines
 
 class BetAmountModal(Modal, title="💰 Place Your Bet"):
     def __init__(self, parent_view, bet_type, bet_choice):
@@ -1079,12 +2814,13 @@ class BetAmountModal(Modal, title="💰 Place Your Bet"):
     async def on_submit(self, interaction: discord.Interaction):
         try:
             bet_amount = int(self.amount.value)
-            if bet_amount < MIN_BET_ROULETTE or bet_amount > MAX_BET_ROULETTE:
-                await interaction.response.send_message(f"❌ Bet must be {MIN_BET_ROULETTE}-{MAX_BET_ROULETTE} PNG!", ephemeral=True)
-                return
-            await self.parent_view.spin(interaction, self.bet_type, self.bet_choice, bet_amount)
         except ValueError:
             await interaction.response.send_message("❌ Enter a valid number!", ephemeral=True)
+            return
+        if bet_amount < MIN_BET_ROULETTE or bet_amount > MAX_BET_ROULETTE:
+            await interaction.response.send_message(f"❌ Bet must be {MIN_BET_ROULETTE}-{MAX_BET_ROULETTE} PNG!", ephemeral=True)
+            return
+        await self.parent_view.place_bet(interaction, self.bet_type, self.bet_choice, bet_amount)
 
 class MultiNumberButtonView(View):
     def __init__(self, parent_view, bet_type, required_count):
@@ -1179,117 +2915,81 @@ class RouletteView(View):
     def __init__(self, user_id):
         super().__init__(timeout=300)
         self.user_id = str(user_id)
-        self.current_bet_amount = None
-        self.current_bet_type = None
-        self.current_bet_choice = None
+        self.slip = []  # RouletteBets for the next spin; stakes are taken when it spins
 
-    async def spin(self, interaction: discord.Interaction, bet_type=None, bet_choice=None, bet_amount=None):
+    async def interaction_check(self, interaction: discord.Interaction):
+        if str(interaction.user.id) != self.user_id:
+            await interaction.response.send_message("❌ This isn't your table! Use `/roulette` to get one.", ephemeral=True)
+            return False
+        return True
+
+    async def place_bet(self, interaction: discord.Interaction, bet_type, bet_choice, bet_amount):
+        if len(self.slip) >= MAX_SLIP_BETS:
+            await interaction.response.send_message(f"❌ A slip holds at most {MAX_SLIP_BETS} bets — spin first!", ephemeral=True)
+            return
+        try:
+            bet = RouletteBet(bet_type, bet_choice, bet_amount)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}!", ephemeral=True)
+            return
+        staked = sum(b.amount for b in self.slip) + bet_amount
+        if staked > get_account(interaction.user.id)[1]["balance"]:
+            await interaction.response.send_message(f"❌ Not enough balance for a {staked} PNG slip!", ephemeral=True)
+            return
+
+        self.slip.append(bet)
+        await interaction.response.send_message(
+            f"🧾 Added **{bet_amount} PNG** on {bet.label()} — slip: {len(self.slip)} bets, **{staked} PNG**. Press 🎡 SPIN when ready!",
+            ephemeral=True
+        )
+
+    async def spin(self, interaction: discord.Interaction):
+        if not self.slip:
+            await interaction.response.send_message("❌ Place a bet first!", ephemeral=True)
+            return
         await interaction.response.defer()
-        data, account = get_account(interaction.user.id)
+        bets, self.slip = self.slip, []
 
-        # Store bet info
-        self.current_bet_amount = bet_amount
-        self.current_bet_type = bet_type
-        self.current_bet_choice = bet_choice
-
-        if bet_type and bet_amount:
-            if account["balance"] < bet_amount:
-                await interaction.followup.send("❌ Not enough balance!", ephemeral=True)
-                self.current_bet_amount = None
-                self.current_bet_type = None
-                self.current_bet_choice = None
-                return
-            account["balance"] -= bet_amount
-            save_economy(data)
+        # ============ GET RESULT ============
+        # Settled up front: the stake and payout move in one ledger step before the animation
+        result = random.choice(ROULETTE_NUMBERS)
+        color = check_color(result)
+        staked = sum(bet.amount for bet in bets)
+        payout = sum(bet.payout(result) for bet in bets)
+        try:
+            account = await ledger.settle_wager(interaction.user.id, staked, payout)
+        except InsufficientFunds:
+            self.slip = bets
+            await interaction.followup.send(f"❌ Not enough balance for your {staked} PNG slip! Use 🧹 CLEAR to start over.", ephemeral=True)
+            return
 
         # ============ ANIMATION ============
         anim_msg = await interaction.followup.send("🎡 **Spinning the wheel...**")
         
         # Animate the ball
-        for i in range(12):
-            ball_pos = i * 3
-            spinner = create_spinner_animation(ball_pos)
-            
-            if i < 4:
-                status = "**🏀 Ball is spinning...**"
-            elif i < 8:
-                status = "**🏀⚡ Ball is spinning faster...**"
-            else:
-                status = "**🏀🎯 Ball is slowing down...**"
-            
-            await anim_msg.edit(content=f"{spinner}\n\n{status}")
+        for frame in SPIN_ANIMATION:
+            await anim_msg.edit(content=frame)
             await asyncio.sleep(0.3)
         
         await asyncio.sleep(0.2)
-        
-        # ============ GET RESULT ============
-        numbers = list(range(37)) + ["00"]
-        result = random.choice(numbers)
-        color = check_color(result)
-        
-        # Calculate win/loss
-        win = False
-        payout = 0
-        
-        if self.current_bet_type and self.current_bet_amount:
-            bet_type = self.current_bet_type
-            bet_choice = self.current_bet_choice
-            bet_amount = self.current_bet_amount
-            
-            if bet_type in ["single", "split", "street", "corner", "six_line"]:
-                if str(result) in bet_choice:  # bet_choice is a list of strings
-                    win = True
-                multiplier = BET_TYPES[bet_type]
-            elif bet_type == "red_black" and bet_choice.lower() == color:
-                win = True
-                multiplier = 1
-            elif bet_type == "even_odd" and result not in ["0", "00"]:
-                if (bet_choice.lower() == "even" and int(result) % 2 == 0) or \
-                   (bet_choice.lower() == "odd" and int(result) % 2 == 1):
-                    win = True
-                multiplier = 1
-            elif bet_type == "low_high" and result not in ["0", "00"]:
-                if (bet_choice.lower() == "low" and 1 <= int(result) <= 18) or \
-                   (bet_choice.lower() == "high" and 19 <= int(result) <= 36):
-                    win = True
-                multiplier = 1
-            elif bet_type == "dozen" and result not in ["0", "00"]:
-                dozens = {"1st": range(1, 13), "2nd": range(13, 25), "3rd": range(25, 37)}
-                if int(result) in dozens[bet_choice]:
-                    win = True
-                multiplier = 2
-            elif bet_type == "column" and result not in ["0", "00"]:
-                columns = {
-                    "1st": {1, 4, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34},  # ✅ FIXED
-                    "2nd": {2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 32, 35},  # ✅ FIXED
-                    "3rd": {3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36}   # ✅ FIXED
-                }
-                if int(result) in columns[bet_choice]:
-                    win = True
-                multiplier = 2
-
-            if win:
-                payout = bet_amount * multiplier
-                account["balance"] += payout
-                account["total_won"] += payout
-                outcome_text = f"🎉 **WIN!** +{payout} PNG"
-                color_theme = discord.Color.gold()
-                save_economy(data)
-            else:
-                account["total_lost"] += bet_amount
-                outcome_text = f"💀 **LOST** -{bet_amount} PNG"
-                color_theme = discord.Color.red()
-                save_economy(data)
-        else:
-            outcome_text = "ℹ️ No bet placed"
+
+        net = payout - staked
+        if net > 0:
+            outcome_text = f"🎉 **WIN!** +{net} PNG"
+            color_theme = discord.Color.gold()
+        elif payout:
+            outcome_text = f"😐 **BACK {payout}** ({net:+} PNG)"
             color_theme = discord.Color.blue()
+        else:
+            outcome_text = f"💀 **LOST** -{staked} PNG"
+            color_theme = discord.Color.red()
 
         # Update inactivity counter
         if self.user_id in ACTIVE_SESSIONS:
             ACTIVE_SESSIONS[self.user_id]["inactive_rounds"] = 0
 
         # ============ FINAL EMBED ============
-        table = create_roulette_table(result, color)
+        table = create_roulette_table(result)
         
         embed = discord.Embed(
             title="🎡 **ROULETTE RESULT** 🎡",
@@ -1297,35 +2997,26 @@ class RouletteView(View):
             description=f"```\n{table}\n```"
         )
         
-        # Bet info
-        bet_info = f"**{self.current_bet_amount} PNG**" if self.current_bet_amount else "None"
-        bet_type_display = self.current_bet_type.replace("_", " ").title() if self.current_bet_type else "-"
-        
-        if self.current_bet_choice:
-            if isinstance(self.current_bet_choice, list):
-                bet_choice_display = f" ({', '.join(self.current_bet_choice)})"
-            else:
-                bet_choice_display = f" ({self.current_bet_choice})"
-        else:
-            bet_choice_display = ""
-        
         embed.add_field(name="👤 Player", value=interaction.user.mention, inline=True)
-        embed.add_field(name="💰 Bet", value=bet_info, inline=True)
-        embed.add_field(name="🎯 Type", value=f"{bet_type_display}{bet_choice_display}", inline=True)
+        embed.add_field(name="💰 Staked", value=f"**{staked} PNG** on {len(bets)} bets", inline=True)
         embed.add_field(name="📊 Result", value=f"**{result}** • {color.upper()}", inline=True)
         embed.add_field(name="💸 Outcome", value=outcome_text, inline=True)
         embed.add_field(name="💎 Balance", value=f"{account['balance']} PNG", inline=True)
+        embed.add_field(name="🧾 Slip", value="\n".join(slip_lines(bets, result))[:1024], inline=False)
         
-        embed.set_footer(text="Click buttons to bet again • Stay or Leave to continue")
-        
-        # Reset bet for next round
-        self.current_bet_amount = None
-        self.current_bet_type = None
-        self.current_bet_choice = None
+        embed.set_footer(text="Build a new slip and spin again • Stay or Leave to continue")
         
         await anim_msg.edit(content=None, embed=embed, view=self)
 
     # ============ BUTTONS ============
+    @discord.ui.button(label="🎡 SPIN", style=discord.ButtonStyle.success, row=3)
+    async def spin_button(self, interaction, button: Button):
+        await self.spin(interaction)
+
+    @discord.ui.button(label="🧹 CLEAR", style=discord.ButtonStyle.secondary, row=3)
+    async def clear(self, interaction, button: Button):
+        await self.clear_slip(interaction)
+
     @discord.ui.button(label="🔴 RED", style=discord.ButtonStyle.danger, row=0)
     async def red(self, interaction, button: Button):
         modal = BetAmountModal(self, "red_black", "red")
@@ -1428,23 +3119,138 @@ class RouletteView(View):
 
     @discord.ui.button(label="🛑 STAY", style=discord.ButtonStyle.primary, row=4)
     async def stay(self, interaction, button: Button):
-        if self.user_id in ACTIVE_SESSIONS:
-            ACTIVE_SESSIONS[self.user_id]["inactive_rounds"] = 0
+        user_id = str(interaction.user.id)
+        if user_id in ACTIVE_SESSIONS:
+            ACTIVE_SESSIONS[user_id]["inactive_rounds"] = 0
         await interaction.response.send_message("👍 Staying at the table!", ephemeral=True)
 
     @discord.ui.button(label="🚪 LEAVE", style=discord.ButtonStyle.danger, row=4)
     async def leave(self, interaction, button: Button):
-        ACTIVE_SESSIONS.pop(self.user_id, None)
+        ACTIVE_SESSIONS.pop(str(interaction.user.id), None)
         await interaction.response.send_message("👋 You left the table. Come back anytime!", ephemeral=True)
-        self.stop()
+        if not isinstance(self, RouletteTableView):
+            self.stop()
+
+    async def clear_slip(self, interaction: discord.Interaction):
+        self.slip = []
+        await interaction.response.send_message("🧹 Slip cleared.", ephemeral=True)
+
+class RouletteTableView(RouletteView):
+    """The same betting buttons, but bets go onto the channel's shared table instead of spinning"""
+    def __init__(self, table):
+        super().__init__(user_id=None)
+        self.table = table
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return True
+
+    async def place_bet(self, interaction: discord.Interaction, bet_type, bet_choice, bet_amount):
+        if len(self.table.slips.get(interaction.user.id, ())) >= MAX_SLIP_BETS:
+            await interaction.response.send_message(f"❌ You already have {MAX_SLIP_BETS} bets on this round!", ephemeral=True)
+            return
+        try:
+            bet = RouletteBet(bet_type, bet_choice, bet_amount)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ {e}!", ephemeral=True)
+            return
+        staked = sum(b.amount for b in self.table.slips.get(interaction.user.id, ())) + bet_amount
+        if staked > get_account(interaction.user.id)[1]["balance"]:
+            await interaction.response.send_message(f"❌ Not enough balance for a {staked} PNG slip!", ephemeral=True)
+            return
+
+        self.table.place(interaction.user.id, bet)
+        await interaction.response.send_message(
+            f"✅ **{bet_amount} PNG** on {bet.label()} — slip: **{staked} PNG**, taken when the wheel spins in {self.table.seconds_left()}s.",
+            ephemeral=True
+        )
+
+    async def spin(self, interaction: discord.Interaction):
+        await interaction.response.send_message(f"🎡 The table spins by itself — {self.table.seconds_left()}s to go!", ephemeral=True)
+
+    async def clear_slip(self, interaction: discord.Interaction):
+        await interaction.response.send_message("❌ Bets on a shared table can't be taken back.", ephemeral=True)
+
+class RouletteTable:
+    """One wheel per channel: bets collect for ROULETTE_BETTING_WINDOW seconds and the whole round is
+    settled on a single spin, so a round costs one message and one animation however many players bet"""
+    MAX_BET_LINES = 25
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.slips = {}  # user id -> RouletteBets (stakes are taken when the round is settled)
+        self.round = None
+        self.spins_at = 0
+
+    def seconds_left(self):
+        return max(0, round(self.spins_at - asyncio.get_running_loop().time()))
+
+    def place(self, user_id, bet):
+        """Add a bet to the user's slip; the first bet of a round opens the betting window"""
+        self.slips.setdefault(user_id, []).append(bet)
+        if self.round is None:
+            self.spins_at = asyncio.get_running_loop().time() + ROULETTE_BETTING_WINDOW
+            self.round = asyncio.create_task(self.play_round())
+
+    async def play_round(self):
+        await asyncio.sleep(ROULETTE_BETTING_WINDOW)
+        # Close betting; anything placed from here on opens the next round
+        slips, self.slips, self.round = self.slips, {}, None
+
+        # Stakes and payouts move together in one ledger step per player, so a round that never
+        # gets here costs nobody anything. Settle before animating so a failed edit changes nothing.
+        result = random.choice(ROULETTE_NUMBERS)
+        color = check_color(result)
+        lines = []
+        paid = bets = 0
+        for user_id, slip in slips.items():
+            staked = sum(bet.amount for bet in slip)
+            payout = sum(bet.payout(result) for bet in slip)
+            try:
+                await ledger.settle_wager(user_id, staked, payout)
+            except InsufficientFunds:
+                lines.append(f"<@{user_id}> • ❌ {staked} PNG slip void (not enough balance)")
+                continue
+            paid += payout
+            bets += len(slip)
+            lines.extend(f"<@{user_id}> • {line}" for line in slip_lines(slip, result))
+        print(f"🎡 Roulette round in #{self.channel}: {bets} bets, landed {result}, paid {paid} PNG")
+
+        if len(lines) > self.MAX_BET_LINES:
+            lines[self.MAX_BET_LINES:] = [f"…and {len(lines) - self.MAX_BET_LINES} more bets"]
+        embed = discord.Embed(
+            title="🎡 **ROULETTE TABLE RESULT** 🎡",
+            color=discord.Color.gold() if paid else discord.Color.red(),
+            description=f"```\n{create_roulette_table(result)}\n```"
+        )
+        embed.add_field(name="📊 Result", value=f"**{result}** • {color.upper()}", inline=True)
+        embed.add_field(name="🎲 Bets", value=str(bets), inline=True)
+        embed.add_field(name="💸 Paid Out", value=f"{paid} PNG", inline=True)
+        embed.add_field(name="🧾 Round", value="\n".join(lines)[:1024], inline=False)
+        embed.set_footer(text=f"Place bets for the next round • The wheel spins {ROULETTE_BETTING_WINDOW}s after the first bet")
+
+        try:
+            message = await self.channel.send("🎡 **Spinning the wheel...**")
+            for frame in SPIN_ANIMATION:
+                await message.edit(content=frame)
+                await asyncio.sleep(0.3)
+            await asyncio.sleep(0.2)
+            await message.edit(content=None, embed=embed, view=RouletteTableView(self))
+        except discord.HTTPException as e:
+            print(f"⚠️ Couldn't show roulette round in #{self.channel}: {e}")
 
 @bot.tree.command(name="roulette", description="🎡 Join the roulette table and place your bets!", guild=guild)
-async def roulette_cmd(interaction: discord.Interaction):
+@app_commands.describe(table="Play at this channel's shared table: everyone's bets ride on one spin per round")
+async def roulette_cmd(interaction: discord.Interaction, table: bool = False):
     await interaction.response.defer()
     user_id = str(interaction.user.id)
     
     if user_id not in ACTIVE_SESSIONS:
         ACTIVE_SESSIONS[user_id] = {"inactive_rounds": 0}
+
+    if table:
+        shared = ROULETTE_TABLES.get(interaction.channel_id)
+        if shared is None:
+            shared = ROULETTE_TABLES[interaction.channel_id] = RouletteTable(interaction.channel)
     
     data, account = get_account(interaction.user.id)
     
@@ -1476,6 +3282,13 @@ async def roulette_cmd(interaction: discord.Interaction):
     )
     embed.add_field(name="💰 Payouts", value=payouts, inline=False)
     
+    if table:
+        waiting = f"{len(shared.slips)} players in, spinning in {shared.seconds_left()}s" if shared.round else "waiting for the first bet"
+        embed.add_field(name="🎰 Shared Table", value=f"One spin for everyone, {ROULETTE_BETTING_WINDOW}s after the first bet ({waiting})", inline=False)
+        embed.set_footer(text="Everyone in this channel bets on the same spin! 🎡")
+        await interaction.followup.send(embed=embed, view=RouletteTableView(shared))
+        return
+
     embed.set_footer(text="Place your bets and watch the wheel spin! 🎡")
     
     await interaction.followup.send(embed=embed, view=RouletteView(user_id))
@@ -1493,8 +3306,55 @@ async def check_inactive_sessions():
         print(f"👋 Removed inactive roulette player {user_id}")
 
 # ================= LEADERBOARD COINS =================
+RICH_LIST_PAGE_SIZE = 10
+
+def rich_list_pages():
+    return max(1, math.ceil(len(load_economy()["users"]) / RICH_LIST_PAGE_SIZE))
+
+def rich_list_embed(page, viewer_id):
+    """One page of the rich list; mentions go in the description since field names don't render them"""
+    start = page * RICH_LIST_PAGE_SIZE
+    lines = [
+        f"**{rank}.** <@{user_id}> — {info['balance']} PNG"
+        for rank, (user_id, info) in enumerate(storage.top_balances(RICH_LIST_PAGE_SIZE, start), start=start + 1)
+    ]
+    embed = discord.Embed(title="🏆 PNG Rich List", color=discord.Color.gold(), description="\n".join(lines))
+    rank = storage.balance_rank(viewer_id)
+    your_rank = f"Your rank: #{rank} of {len(load_economy()['users'])}" if rank else "You don't have an account yet"
+    embed.set_footer(text=f"Page {page + 1}/{rich_list_pages()} • {your_rank}")
+    return embed
+
+class RichListView(View):
+    def __init__(self, page=0):
+        super().__init__(timeout=120)
+        self.page = page
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= rich_list_pages() - 1
+
+    async def show(self, interaction, page):
+        self.page = min(max(page, 0), rich_list_pages() - 1)
+        self.update_buttons()
+        await interaction.response.edit_message(embed=rich_list_embed(self.page, interaction.user.id), view=self)
+
+    @discord.ui.button(label="◀️ PREV", style=discord.ButtonStyle.secondary, row=0)
+    async def previous_page(self, interaction: discord.Interaction, button: Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="📍 MY RANK", style=discord.ButtonStyle.primary, row=0)
+    async def my_rank(self, interaction: discord.Interaction, button: Button):
+        rank = storage.balance_rank(interaction.user.id) or 1
+        await self.show(interaction, (rank - 1) // RICH_LIST_PAGE_SIZE)
+
+    @discord.ui.button(label="NEXT ▶️", style=discord.ButtonStyle.secondary, row=0)
+    async def next_page(self, interaction: discord.Interaction, button: Button):
+        await self.show(interaction, self.page + 1)
+
 @bot.tree.command(name="leaderboardcoins", description="Top richest players", guild=guild)
-async def leaderboardcoins(interaction: discord.Interaction):
+@app_commands.describe(page="Page of the rich list (10 per page)")
+async def leaderboardcoins(interaction: discord.Interaction, page: int = 1):
     await interaction.response.defer()
     data = load_economy()
 
@@ -1502,15 +3362,50 @@ async def leaderboardcoins(interaction: discord.Interaction):
         await interaction.followup.send("No data yet.")
         return
 
-    sorted_users = sorted(data["users"].items(), key=lambda x: x[1]["balance"], reverse=True)
+    page = min(max(page, 1), rich_list_pages()) - 1
+    await interaction.followup.send(embed=rich_list_embed(page, interaction.user.id), view=RichListView(page))
 
-    embed = discord.Embed(title="🏆 PNG Rich List", color=discord.Color.gold())
-    for i, (user_id, info) in enumerate(sorted_users[:10], start=1):
-        embed.add_field(name=f"{i}. <@{user_id}>", value=f"{info['balance']} PNG", inline=False)
+@bot.tree.command(name="rank", description="Your place on the PNG rich list", guild=guild)
+@app_commands.describe(user="Whose rank to look up (default: you)")
+async def rank(interaction: discord.Interaction, user: discord.Member = None):
+    await interaction.response.defer()
+    user = user or interaction.user
+    position = storage.balance_rank(user.id)
+    if position is None:
+        await interaction.followup.send(f"{user.mention} doesn't have an account yet.", ephemeral=True)
+        return
 
+    total = len(load_economy()["users"])
+    account = load_economy()["users"][str(user.id)]
+    embed = discord.Embed(title="📍 Rich List Rank", color=discord.Color.gold())
+    embed.add_field(name="User", value=user.mention)
+    embed.add_field(name="Rank", value=f"#{position} of {total}")
+    embed.add_field(name="Balance", value=f"{account['balance']} PNG")
     await interaction.followup.send(embed=embed)
 
 # ================= KILLS COMMANDS =================
+def learn_display_name(guild, key):
+    """Alias a mention key to the member's display name, if the member is cached"""
+    mention = MENTION_KEY.fullmatch(key)
+    if mention is None:
+        return
+    user = (guild and guild.get_member(int(mention.group(1)))) or bot.get_user(int(mention.group(1)))
+    if user is not None:
+        kills_index.names.set_alias(key, user.display_name)
+
+async def player_autocomplete(interaction: discord.Interaction, current: str):
+    choices = []
+    for key in kills_index.names.suggest(current):
+        learn_display_name(interaction.guild, key)
+        choices.append(app_commands.Choice(name=kills_index.names.label(key)[:100], value=key))
+    return choices
+
+def did_you_mean(player):
+    suggestions = [key for key in kills_index.names.suggest(player, 3) if key != player]
+    if not suggestions:
+        return ""
+    return " Did you mean " + ", ".join(f"**{kills_index.names.label(key)}**" for key in suggestions) + "?"
+
 @bot.tree.command(name="ping", description="Check bot latency and hype!", guild=guild)
 async def ping(interaction: discord.Interaction):
     await interaction.response.defer()
@@ -1525,10 +3420,13 @@ async def help_command(interaction: discord.Interaction):
         "📜 **PNG Bot Commands** 📜\n\n"
         "🎯 **Kills Leaderboard** 🎯\n"
         "🔹 `/addkills player:<name> regular:<num> team:<num> month:<YYYY-MM>` — Add kills (Auth only)\n"
-        "🔹 `/leaderboard month:<YYYY-MM>` — Show top players\n"
+        "🔹 `/importkills file:<csv/json> month:<YYYY-MM>` — Bulk add kills (Auth only)\n"
+        "🔹 `/leaderboard month:<YYYY-MM> page:<num>` — Show top players\n"
         "🔹 `/player player:<name> month:<YYYY-MM>` — Show player stats\n"
+        "🔹 `/alltime`, `/yearly year:<YYYY>`, `/season name:<season>` — Kills across months\n"
         "🔹 `/resetmonth month:<YYYY-MM>` — Reset month (Auth only)\n"
-        "🔹 `/leaderboardcoins` — Top richest players\n"
+        "🔹 `/leaderboardcoins page:<num>` — Top richest players\n"
+        "🔹 `/rank user:<user>` — Your place on the rich list\n"
         "🔹 `/ping` — Bot latency\n\n"
         "🎰 **Casino** 🎰\n"
         "🔹 `/balance` — Check PNG balance\n"
@@ -1537,7 +3435,8 @@ async def help_command(interaction: discord.Interaction):
         "🔹 `/dice bet:<amount>` — Roll vs bot\n"
         "🔹 `/dicevs opponent:<user> bet:<amount>` — Duel\n"
         "🔹 `/slots bet:<amount>` — Play slots\n"
-        "🔹 `/roulette` — Join roulette table\n\n"
+        "🔹 `/roulette` — Join roulette table\n"
+        "🔹 `/roulette table:True` — Shared channel table, one spin per round\n\n"
         "⚠️ **All commands are public unless it's an error!**"
     )
     await interaction.followup.send(help_text)
@@ -1551,67 +3450,293 @@ async def addkills(interaction: discord.Interaction, player: str, regular: int =
 
     await interaction.response.defer()
     
-    data = load_data()
     month_key = get_month_key(month)
+    try:
+        await reopen_month(month_key)
+    except StorageError as e:
+        await interaction.followup.send(f"❌ {e}")
+        return
+    data = load_data()
 
     if month_key not in data:
         data[month_key] = {}
+    new_player = player not in kills_index.names.keys
+    note = f"\n🆕 First kills ever recorded for **{player}**.{did_you_mean(player)}" if new_player else ""
     if player not in data[month_key]:
         data[month_key][player] = {"regular": 0, "team": 0}
 
     total_team = math.ceil(team / 2)
     data[month_key][player]["regular"] += regular
     data[month_key][player]["team"] += total_team
-    save_data(data)
+    save_data(data, month_key, players=[player])
 
     await interaction.followup.send(
-        f"✅ {interaction.user.mention} added **{regular} regular** + **{total_team} team** kills for **{player}** in **{month_key}**."
+        f"✅ {interaction.user.mention} added **{regular} regular** + **{total_team} team** kills for **{player}** in **{month_key}**.{note}"
     )
 
+addkills.autocomplete("player")(player_autocomplete)
+
+LEADERBOARD_PAGE_SIZE = 10
+
+async def find_ranking(key):
+    """A month or rollup ranking, loading archived months as needed (raises StorageError)"""
+    if key in kills_index.rankings or ":" in key or key == "all":
+        return kills_index.ranking(key)
+    return (await load_month(key))[1]
+
+def leaderboard_pages(ranking):
+    return max(1, math.ceil(len(ranking) / LEADERBOARD_PAGE_SIZE))
+
+def leaderboard_message(ranking, title, page):
+    pages = leaderboard_pages(ranking)
+    msg = f"🏆 **{title}** 🏆\n"
+    for rank, player, score in ranking.page(page * LEADERBOARD_PAGE_SIZE, LEADERBOARD_PAGE_SIZE):
+        msg += f"{rank}. {player} — {score} kills\n"
+    if pages > 1:
+        msg += f"\nPage {page + 1}/{pages} • {len(ranking)} players"
+    return msg
+
+class LeaderboardView(View):
+    def __init__(self, key, title, page, pages):
+        super().__init__(timeout=120)
+        self.key = key
+        self.title = title
+        self.page = page
+        self.update_buttons(pages)
+
+    def update_buttons(self, pages):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= pages - 1
+
+    async def show(self, interaction, page):
+        try:
+            ranking = await find_ranking(self.key)
+        except StorageError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+        self.page = min(max(page, 0), leaderboard_pages(ranking) - 1)
+        self.update_buttons(leaderboard_pages(ranking))
+        await interaction.response.edit_message(content=leaderboard_message(ranking, self.title, self.page), view=self)
+
+    @discord.ui.button(label="◀️ Previous", style=discord.ButtonStyle.secondary, row=0)
+    async def previous_page(self, interaction: discord.Interaction, button: Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next ▶️", style=discord.ButtonStyle.secondary, row=0)
+    async def next_page(self, interaction: discord.Interaction, button: Button):
+        await self.show(interaction, self.page + 1)
+
+async def send_leaderboard(interaction, key, ranking, title, page):
+    """Reply with one page of a ranking, with Previous/Next buttons when there is more than one"""
+    pages = leaderboard_pages(ranking)
+    page = min(max(page, 1), pages) - 1
+    if pages > 1:
+        await interaction.followup.send(leaderboard_message(ranking, title, page), view=LeaderboardView(key, title, page, pages))
+    else:
+        await interaction.followup.send(leaderboard_message(ranking, title, page))
+
 @bot.tree.command(name="leaderboard", description="Show leaderboard for a month", guild=guild)
-@app_commands.describe(month="Month YYYY-MM")
-async def leaderboard(interaction: discord.Interaction, month: str = None):
+@app_commands.describe(month="Month YYYY-MM", page="Page (10 players per page)")
+async def leaderboard(interaction: discord.Interaction, month: str = None, page: int = 1):
     await interaction.response.defer()
-    data = load_data()
     month_key = get_month_key(month)
+    try:
+        ranking = await find_ranking(month_key)
+    except StorageError as e:
+        await interaction.followup.send(f"❌ {e}")
+        return
 
-    if month_key not in data or not data[month_key]:
+    if not ranking:
         await interaction.followup.send(f"No data for {month_key}.")
         return
 
-    leaderboard_list = []
-    for player, stats in data[month_key].items():
-        total = stats.get("regular", 0) + stats.get("team", 0)
-        leaderboard_list.append((player, total))
+    await send_leaderboard(interaction, month_key, ranking, f"Leaderboard for {month_key}", page)
 
-    leaderboard_list.sort(key=lambda x: x[1], reverse=True)
+@bot.tree.command(name="alltime", description="All-time kills leaderboard", guild=guild)
+@app_commands.describe(page="Page (10 players per page)")
+async def alltime(interaction: discord.Interaction, page: int = 1):
+    await interaction.response.defer()
+    if not kills_index.ranking("all"):
+        await interaction.followup.send("No data yet.")
+        return
+    await send_leaderboard(interaction, "all", kills_index.ranking("all"), "All-Time Leaderboard", page)
 
-    msg = f"🏆 **Leaderboard for {month_key}** 🏆\n"
-    for i, (player, score) in enumerate(leaderboard_list[:10], start=1):
-        msg += f"{i}. {player} — {score} kills\n"
+@bot.tree.command(name="yearly", description="Kills leaderboard for a whole year", guild=guild)
+@app_commands.describe(year="Year YYYY (default: this year)", page="Page (10 players per page)")
+async def yearly(interaction: discord.Interaction, year: str = None, page: int = 1):
+    await interaction.response.defer()
+    year = year or datetime.now().strftime("%Y")
+    if not kills_index.ranking(f"year:{year}"):
+        years = ", ".join(kills_index.years()) or "none"
+        await interaction.followup.send(f"No data for {year}. Years with data: {years}.")
+        return
+    await send_leaderboard(interaction, f"year:{year}", kills_index.ranking(f"year:{year}"), f"Leaderboard for {year}", page)
 
-    await interaction.followup.send(msg)
+@bot.tree.command(name="season", description="Kills leaderboard for a season", guild=guild)
+@app_commands.describe(name="Season name", page="Page (10 players per page)")
+async def season(interaction: discord.Interaction, name: str, page: int = 1):
+    await interaction.response.defer()
+    if name not in KILL_SEASONS:
+        seasons = ", ".join(f"{n} ({first} to {last})" for n, (first, last) in KILL_SEASONS.items()) or "none configured"
+        await interaction.followup.send(f"Unknown season **{name}**. Seasons: {seasons}.")
+        return
+    first, last = KILL_SEASONS[name]
+    if not kills_index.ranking(f"season:{name}"):
+        await interaction.followup.send(f"No data for {name} yet.")
+        return
+    await send_leaderboard(
+        interaction, f"season:{name}", kills_index.ranking(f"season:{name}"), f"{name} Leaderboard ({first} to {last})", page
+    )
 
 @bot.tree.command(name="player", description="Show a player's kills for a month", guild=guild)
 @app_commands.describe(player="Player ID or name", month="Month YYYY-MM")
 async def player(interaction: discord.Interaction, player: str, month: str = None):
     await interaction.response.defer()
-    data = load_data()
     month_key = get_month_key(month)
+    try:
+        month_data, ranking = await load_month(month_key)
+    except StorageError as e:
+        await interaction.followup.send(f"❌ {e}")
+        return
 
-    if month_key not in data or player not in data[month_key]:
-        await interaction.followup.send(f"No data for {player} in {month_key}.")
+    if player not in month_data:
+        await interaction.followup.send(f"No data for {player} in {month_key}.{did_you_mean(player)}")
         return
 
-    stats = data[month_key][player]
+    stats = month_data[player]
     total = stats.get("regular", 0) + stats.get("team", 0)
+    rank = ranking.rank(player)
+    alltime = kills_index.ranking("all")
     await interaction.followup.send(
         f"📊 **{player} — {month_key}**\n"
         f"Regular kills: {stats.get('regular',0)}\n"
         f"Team kills (halved): {stats.get('team',0)}\n"
-        f"**Total: {total} kills**"
+        f"**Total: {total} kills**\n"
+        f"🏅 Rank: #{rank} of {len(ranking)} (top {rank / len(ranking) * 100:.1f}%)\n"
+        f"🌍 All-time: {alltime.totals.get(player, 0)} kills, #{alltime.rank(player) or len(alltime) + 1} of {len(alltime)}"
     )
 
+player.autocomplete("player")(player_autocomplete)
+
+IMPORT_MAX_BYTES = 5 * 1024 * 1024
+IMPORT_MAX_ROWS = 50000
+IMPORT_ERRORS_SHOWN = 10
+MONTH_KEY = re.compile(r"\d{4}-\d{2}")
+
+def kill_rows(content):
+    """Yield (line number, row dict, error) from CSV (header: player,regular,team[,month]),
+    NDJSON (one object per line) or a JSON array, reading line by line where the format allows.
+    A bad NDJSON line comes back as its error instead of ending the import."""
+    text = content.decode("utf-8-sig")
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        for number, row in enumerate(json.loads(text), start=1):
+            yield number, row, None
+    elif stripped.startswith("{"):
+        for number, line in enumerate(io.StringIO(text), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield number, None, f"invalid JSON ({e.msg})"
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        for row in reader:
+            yield reader.line_num, {(k or "").strip().lower(): v for k, v in row.items()}, None
+
+def parse_kill_row(row, default_month):
+    """(player, regular, halved team, month) from one imported row; raises ValueError with the reason"""
+    if not isinstance(row, dict):
+        raise ValueError("not an object")
+    player = str(row.get("player") or "").strip()
+    if not player:
+        raise ValueError("missing player")
+    counts = []
+    for field in ("regular", "team"):
+        value = row.get(field)
+        try:
+            value = int(str(value).strip()) if value not in (None, "") else 0
+        except ValueError:
+            raise ValueError(f"{field} must be a whole number, got {value!r}")
+        if value < 0:
+            raise ValueError(f"{field} can't be negative")
+        counts.append(value)
+    month_key = str(row.get("month") or "").strip() or default_month
+    if not MONTH_KEY.fullmatch(month_key):
+        raise ValueError(f"month must be YYYY-MM, got {month_key!r}")
+    return player, counts[0], math.ceil(counts[1] / 2), month_key
+
+@bot.tree.command(name="importkills", description="Import kills from a CSV/JSON file (Authorized only)", guild=guild)
+@app_commands.describe(
+    file="CSV with player,regular,team[,month] columns, or JSON/NDJSON objects with those keys",
+    month="Month YYYY-MM for rows without one",
+    dry_run="Only validate the file"
+)
+async def importkills(interaction: discord.Interaction, file: discord.Attachment, month: str = None, dry_run: bool = False):
+    if not is_authorized(interaction.user.id):
+        await interaction.response.send_message("❌ Not authorized.", ephemeral=True)
+        return
+
+    await interaction.response.defer()
+    if file.size > IMPORT_MAX_BYTES:
+        await interaction.followup.send(f"❌ File is too big ({file.size // 1024} KB, max {IMPORT_MAX_BYTES // 1024 // 1024} MB).")
+        return
+
+    default_month = get_month_key(month)
+    changes = {}  # month -> player -> [regular, team]
+    errors = []
+    rows = 0
+    try:
+        for number, row, error in kill_rows(await file.read()):
+            rows += 1
+            if rows > IMPORT_MAX_ROWS:
+                errors.append(f"row {number}: more than {IMPORT_MAX_ROWS} rows, stopped here")
+                break
+            if error:
+                errors.append(f"row {number}: {error}")
+                continue
+            try:
+                player, regular, team, month_key = parse_kill_row(row, default_month)
+            except ValueError as e:
+                errors.append(f"row {number}: {e}")
+                continue
+            totals = changes.setdefault(month_key, {}).setdefault(player, [0, 0])
+            totals[0] += regular
+            totals[1] += team
+    except (ValueError, csv.Error, UnicodeDecodeError) as e:
+        await interaction.followup.send(f"❌ Couldn't read {file.filename} after {rows} rows: {e}")
+        return
+
+    imported = sum(len(players) for players in changes.values())
+    if changes and not dry_run:
+        try:
+            for month_key in changes:
+                await reopen_month(month_key)
+        except StorageError as e:
+            await interaction.followup.send(f"❌ {e}")
+            return
+        data = load_data()
+        for month_key, players in changes.items():
+            month_data = data.setdefault(month_key, {})
+            for player, (regular, team) in players.items():
+                stats = month_data.setdefault(player, {"regular": 0, "team": 0})
+                stats["regular"] += regular
+                stats["team"] += team
+        # One save for the whole batch
+        save_data(data, *changes, players=[player for players in changes.values() for player in players])
+
+    verb = "Validated" if dry_run else "Imported"
+    months = ", ".join(sorted(changes)) or "no months"
+    msg = f"{'🔍' if dry_run else '✅'} {verb} **{rows - len(errors)}/{rows} rows** ({imported} player-months in {months}) from **{file.filename}**."
+    if errors:
+        msg += f"\n⚠️ {len(errors)} rows skipped:\n" + "\n".join(f"• {error}" for error in errors[:IMPORT_ERRORS_SHOWN])
+    if len(errors) > IMPORT_ERRORS_SHOWN:
+        report = discord.File(io.BytesIO("\n".join(errors).encode("utf-8")), filename="import-errors.txt")
+        await interaction.followup.send(msg[:2000], file=report)
+    else:
+        await interaction.followup.send(msg[:2000])
+
 @bot.tree.command(name="resetmonth", description="Reset all kills for a month (Authorized only)", guild=guild)
 @app_commands.describe(month="Month YYYY-MM")
 async def resetmonth(interaction: discord.Interaction, month: str = None):
@@ -1620,12 +3745,17 @@ async def resetmonth(interaction: discord.Interaction, month: str = None):
         return
 
     await interaction.response.defer()
-    data = load_data()
     month_key = get_month_key(month)
+    try:
+        await reopen_month(month_key)
+    except StorageError as e:
+        await interaction.followup.send(f"❌ {e}")
+        return
+    data = load_data()
 
     if month_key in data:
         data[month_key] = {}
-        save_data(data)
+        save_data(data, month_key)
         await interaction.followup.send(f"⚠️ {interaction.user.mention} reset all data for **{month_key}**.")
     else:
         await interaction.followup.send(f"No data found for {month_key}.")
@@ -1635,23 +3765,45 @@ app = Flask("")
 
 @app.route("/")
 def home():
-    return f"PNG Bot is alive! Mode: {'GitHub' if storage.is_production and storage.token else 'Local'}"
+    return f"PNG Bot is alive! Mode: {storage.mode_name}"
+
+async def read_flush_status():
+    return storage.flush_status()
+
+@app.route("/status")
+def status():
+    # The flush state is changed on the bot's loop, so read it there instead of from Flask's thread
+    loop = bot.loop
+    if not isinstance(loop, asyncio.AbstractEventLoop) or not loop.is_running():
+        return jsonify({"backend": storage.mode_name, "error": "bot is not running"}), 503
+    return jsonify(asyncio.run_coroutine_threadsafe(read_flush_status(), loop).result(timeout=5))
 
 def run_flask():
     port = int(os.environ.get("PORT", 3000))
     app.run(host="0.0.0.0", port=port)
 
-threading.Thread(target=run_flask, daemon=True).start()
-
 # ================= RUN BOT =================
 if __name__ == "__main__":
+    # Backups of the SQLite store: python bot.py export-json | import-json
+    if len(sys.argv) > 1 and sys.argv[1] in ("export-json", "import-json"):
+        if not isinstance(storage, SQLiteStorage):
+            sys.exit("❌ Set STORAGE_BACKEND=sqlite first")
+        if sys.argv[1] == "export-json":
+            storage.export_json(ECON_FILE, DATA_FILE)
+        else:
+            storage.import_json(ECON_FILE, DATA_FILE)
+        sys.exit(0)
+    
+    threading.Thread(target=run_flask, daemon=True).start()
+    
     print("="*50)
     print("🚀 PNG BOT STARTING UP")
     print(f"📁 Base: {BASE_DIR}")
-    print(f"🔧 Mode: {'GitHub' if storage.is_production and storage.token else 'Local'}")
-    if storage.is_production and storage.token:
-        print(f"📦 Repo: {storage.repo}")
-        print(f"🔑 Token: {'✅' if storage.token else '❌'}")
+    print(f"🔧 Mode: {storage.mode_name}")
+    if storage.mode_name == "GitHub":
+        print(f"📦 Repo: {storage.backend.repo}")
+        print(f"🔑 Token: {'✅' if storage.backend.token else '❌'}")
     print("="*50)
     
     bot.run(TOKEN)
+    asyncio.run(storage.shutdown())
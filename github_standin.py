@@ -0,0 +1,273 @@
+# github_standin.py
+"""Local stand-in for the bits of the GitHub REST API the bot's storage uses.
+
+Serves GET/PUT /repos/{owner}/{repo}/contents/{path} with GitHub's semantics: base64 content,
+git blob shas, ETag/If-None-Match (304s are free), 409 on a stale sha, 422 when a sha is
+missing for an existing file, and X-RateLimit-* headers with a 403 once the budget runs out.
+The Git Data calls used for single-commit flushes (ref, commit and tree reads/creates, and a
+fast-forward-only ref update) work against the same branch. Latency, server errors and
+spurious conflicts can be injected to exercise the sync path.
+
+    python github_standin.py --port 8787 --seed-dir .
+    STORAGE_BACKEND=github GITHUB_API_URL=http://127.0.0.1:8787 GITHUBTOKEN=dummy python bot.py
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import time
+
+from aiohttp import web
+
+
+def blob_sha(content):
+    """Same sha git (and so GitHub) gives a file's blob"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def object_sha(kind, value):
+    return hashlib.sha1(f"{kind}:{json.dumps(value, sort_keys=True)}".encode()).hexdigest()
+
+
+class GitHubStandIn:
+    def __init__(self, rate_limit=5000, rate_window=3600, latency=0.0, error_rate=0.0, conflict_rate=0.0, seed=None):
+        self.files = {}  # path -> bytes at the branch head
+        self.trees = {}  # tree sha -> {path: bytes}
+        self.commits = {}  # commit sha -> {"tree": sha, "parents": [...], "message": str}
+        self.head = None
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.latency = latency
+        self.error_rate = error_rate
+        self.conflict_rate = conflict_rate
+        self.random = random.Random(seed)
+        self.used = 0
+        self.reset_at = int(time.time()) + rate_window
+        self.stats = {"GET": 0, "PUT": 0, "304": 0, "409": 0, "422": 0, "403": 0, "5xx": 0, "bytes_in": 0, "bytes_out": 0}
+        self.commit({}, "Initial commit")
+
+    def seed_from(self, directory):
+        files = dict(self.files)
+        shard_dir = os.path.join(directory, "economy")
+        shards = sorted(f"economy/{name}" for name in os.listdir(shard_dir) if name.endswith(".json")) if os.path.isdir(shard_dir) else []
+        for name in ["economy.json", "leaderboard.json"] + shards:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    files[name] = f.read()
+        self.commit(files, "Seed")
+
+    def commit(self, files, message, parents=None):
+        """Record a tree + commit for ``files`` and move the branch to it"""
+        tree_sha = self.store_tree(files)
+        commit_sha = self.store_commit(tree_sha, [self.head] if parents is None and self.head else parents or [], message)
+        self.head = commit_sha
+        self.files = files
+        return commit_sha
+
+    def store_tree(self, files):
+        tree_sha = object_sha("tree", {p: blob_sha(c) for p, c in files.items()})
+        self.trees[tree_sha] = files
+        return tree_sha
+
+    def store_commit(self, tree_sha, parents, message):
+        commit_sha = object_sha("commit", {"tree": tree_sha, "parents": parents, "message": message, "t": time.time()})
+        self.commits[commit_sha] = {"tree": tree_sha, "parents": parents, "message": message}
+        return commit_sha
+
+    def rate_headers(self):
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(self.rate_limit - self.used, 0)),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Used": str(self.used),
+        }
+
+    def error(self, status, message, extra_headers=None):
+        headers = self.rate_headers()
+        headers.update(extra_headers or {})
+        return web.json_response({"message": message}, status=status, headers=headers)
+
+    async def spend(self, request):
+        """Common per-request work: latency, rate budget and injected failures. Returns an error response or None."""
+        if self.latency:
+            await asyncio.sleep(self.latency * (0.5 + self.random.random()))
+
+        now = int(time.time())
+        if now >= self.reset_at:
+            self.used = 0
+            self.reset_at = now + self.rate_window
+
+        if self.used >= self.rate_limit:
+            self.stats["403"] += 1
+            return self.error(403, "API rate limit exceeded", {"Retry-After": str(self.reset_at - now)})
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.used += 1
+            self.stats["5xx"] += 1
+            return self.error(502, "Server Error")
+        return None
+
+    async def contents(self, request):
+        path = request.match_info["path"]
+        self.stats[request.method] = self.stats.get(request.method, 0) + 1
+
+        failure = await self.spend(request)
+        if failure is not None:
+            return failure
+
+        if request.method == "GET":
+            return self.get_contents(request, path)
+        return await self.put_contents(request, path)
+
+    def get_contents(self, request, path):
+        if path not in self.files:
+            self.used += 1
+            return self.error(404, "Not Found")
+
+        content = self.files[path]
+        sha = blob_sha(content)
+        etag = f'"{sha}"'
+        if request.headers.get("If-None-Match") == etag:
+            # Conditional hits don't count against the rate limit on GitHub either
+            self.stats["304"] += 1
+            return web.Response(status=304, headers={"ETag": etag, **self.rate_headers()})
+
+        self.used += 1
+        encoded = base64.encodebytes(content).decode("ascii")  # GitHub wraps at 60 chars too
+        body = {
+            "type": "file", "encoding": "base64", "name": os.path.basename(path), "path": path,
+            "size": len(content), "sha": sha, "content": encoded,
+        }
+        self.stats["bytes_out"] += len(encoded)
+        headers = {"ETag": etag, **self.rate_headers()}
+        return web.json_response(body, headers=headers)
+
+    async def put_contents(self, request, path):
+        self.used += 1
+        try:
+            payload = await request.json()
+            content = base64.b64decode(payload["content"])
+        except (ValueError, KeyError):
+            self.stats["422"] += 1
+            return self.error(422, "Invalid request.")
+        self.stats["bytes_in"] += len(payload["content"])
+
+        current = self.files.get(path)
+        given_sha = payload.get("sha")
+        if current is not None and not given_sha:
+            self.stats["422"] += 1
+            return self.error(422, 'Invalid request.\n\n"sha" wasn\'t supplied.')
+        if current is not None and given_sha != blob_sha(current):
+            self.stats["409"] += 1
+            return self.error(409, f"{path} does not match {given_sha}")
+        if self.conflict_rate and self.random.random() < self.conflict_rate:
+            self.stats["409"] += 1
+            return self.error(409, f"{path} does not match {given_sha}")
+
+        sha = blob_sha(content)
+        commit_sha = self.commit({**self.files, path: content}, payload.get("message", ""))
+        body = {
+            "content": {"name": os.path.basename(path), "path": path, "sha": sha, "size": len(content)},
+            "commit": {"sha": commit_sha, "message": payload.get("message", "")},
+        }
+        return web.json_response(body, status=201 if current is None else 200, headers=self.rate_headers())
+
+    async def git(self, request):
+        """The Git Data endpoints: refs, commits and trees"""
+        self.stats[request.method] = self.stats.get(request.method, 0) + 1
+        failure = await self.spend(request)
+        if failure is not None:
+            return failure
+        self.used += 1
+
+        kind, rest = request.match_info["kind"], request.match_info.get("rest", "")
+        headers = self.rate_headers()
+        if request.method == "GET" and kind == "ref":
+            return web.json_response({"ref": f"refs/{rest}", "object": {"type": "commit", "sha": self.head}}, headers=headers)
+
+        if request.method == "GET" and kind == "commits":
+            commit = self.commits.get(rest)
+            if commit is None:
+                return self.error(404, "Not Found")
+            return web.json_response({"sha": rest, "tree": {"sha": commit["tree"]}, "parents": [{"sha": p} for p in commit["parents"]]}, headers=headers)
+
+        if request.method == "GET" and kind == "trees":
+            files = self.trees.get(rest)
+            if files is None:
+                return self.error(404, "Not Found")
+            entries = [{"path": p, "mode": "100644", "type": "blob", "sha": blob_sha(c)} for p, c in sorted(files.items())]
+            return web.json_response({"sha": rest, "tree": entries, "truncated": False}, headers=headers)
+
+        payload = await request.json()
+        if request.method == "POST" and kind == "trees" and not rest:
+            files = dict(self.trees.get(payload.get("base_tree"), {}))
+            for entry in payload.get("tree", []):
+                if entry.get("sha", "") is None:
+                    files.pop(entry["path"], None)
+                elif "content" in entry:
+                    files[entry["path"]] = entry["content"].encode("utf-8")
+                else:
+                    return self.error(422, "Only inline content is supported by the stand-in")
+            tree_sha = self.store_tree(files)
+            self.stats["bytes_in"] += sum(len(e.get("content", "")) for e in payload.get("tree", []))
+            entries = [{"path": p, "mode": "100644", "type": "blob", "sha": blob_sha(c)} for p, c in sorted(files.items())]
+            return web.json_response({"sha": tree_sha, "tree": entries}, status=201, headers=headers)
+
+        if request.method == "POST" and kind == "commits" and not rest:
+            if payload.get("tree") not in self.trees:
+                return self.error(422, "Tree SHA does not exist")
+            commit_sha = self.store_commit(payload["tree"], payload.get("parents", []), payload.get("message", ""))
+            return web.json_response({"sha": commit_sha, "tree": {"sha": payload["tree"]}}, status=201, headers=headers)
+
+        if request.method == "PATCH" and kind == "refs":
+            commit = self.commits.get(payload.get("sha"))
+            if commit is None:
+                return self.error(422, "Object does not exist")
+            if self.head not in commit["parents"] and not payload.get("force"):
+                self.stats["422"] += 1
+                return self.error(422, "Update is not a fast forward")
+            self.head = payload["sha"]
+            self.files = self.trees[commit["tree"]]
+            return web.json_response({"ref": f"refs/{rest}", "object": {"type": "commit", "sha": self.head}}, headers=headers)
+
+        return self.error(404, "Not Found")
+
+    async def status(self, request):
+        return web.json_response({"files": {p: len(c) for p, c in self.files.items()}, "stats": self.stats, **self.rate_headers()})
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_route("GET", "/repos/{owner}/{repo}/contents/{path:.+}", self.contents)
+        app.router.add_route("PUT", "/repos/{owner}/{repo}/contents/{path:.+}", self.contents)
+        app.router.add_route("*", "/repos/{owner}/{repo}/git/{kind}", self.git)
+        app.router.add_route("*", "/repos/{owner}/{repo}/git/{kind}/{rest:.+}", self.git)
+        app.router.add_get("/_standin/status", self.status)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the GitHub contents API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--seed-dir", help="load economy.json, economy/shard-*.json and leaderboard.json from here at start")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="requests per window")
+    parser.add_argument("--rate-window", type=int, default=3600, help="seconds until the budget resets")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean added latency per request, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 502")
+    parser.add_argument("--conflict-rate", type=float, default=0.0, help="fraction of PUTs rejected with a 409")
+    parser.add_argument("--seed", type=int, help="random seed for the injected faults")
+    args = parser.parse_args()
+
+    standin = GitHubStandIn(args.rate_limit, args.rate_window, args.latency, args.error_rate, args.conflict_rate, args.seed)
+    if args.seed_dir:
+        standin.seed_from(args.seed_dir)
+    print(f"🧪 GitHub stand-in on http://{args.host}:{args.port} ({len(standin.files)} files seeded)")
+    web.run_app(standin.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
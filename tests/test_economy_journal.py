@@ -0,0 +1,86 @@
+# tests/test_economy_journal.py
+"""EconomyJournal replay and compaction.
+
+    python -m unittest discover tests
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import AccountStore, EconomyJournal  # noqa: E402
+
+
+def account(balance):
+    return {"balance": balance, "total_won": 0, "total_lost": 0, "last_daily": 0}
+
+
+class SlowJournal(EconomyJournal):
+    """Holds every disk write long enough for the test to act while compact() is waiting"""
+
+    def write_lines(self, file, lines):
+        time.sleep(0.05)
+        super().write_lines(file, lines)
+
+
+class EconomyJournalTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def replay(self, users=None):
+        economy = {"users": users if users is not None else AccountStore()}
+        replayed = EconomyJournal(self.directory.name).replay(economy)
+        return economy["users"], replayed
+
+    async def test_replay_after_compaction(self):
+        journal = EconomyJournal(self.directory.name)
+        users = AccountStore({"1": account(100)})
+        journal.record("1", users["1"].to_dict())
+        await journal.compact()
+        users["2"] = account(50)
+        journal.record("2", users["2"].to_dict())
+        await journal.close()
+
+        replayed, changed = self.replay()
+        self.assertEqual(changed, {"1", "2"})
+        self.assertEqual(replayed.to_dict(), users.to_dict())
+
+    async def test_record_during_compaction_survives_replay(self):
+        journal = SlowJournal(self.directory.name)
+        users = AccountStore({"1": account(100)})
+        journal.record("1", users["1"].to_dict())
+
+        compaction = asyncio.create_task(journal.compact())
+        await asyncio.sleep(0.01)  # compact() is now waiting on its first sync()
+        users["1"]["balance"] = 999
+        journal.record("1", users["1"].to_dict())
+        await compaction
+        await journal.close()
+
+        replayed, _ = self.replay()
+        self.assertEqual(replayed["1"]["balance"], 999)
+
+    async def test_replay_skips_checkpointed_changes(self):
+        journal = EconomyJournal(self.directory.name)
+        journal.record("1", account(100))
+        journal.record("2", account(200))
+        await journal.checkpoint(journal.seq)
+        journal.record("2", account(250))
+        await journal.close()
+
+        # The backend's copy holds everything up to the checkpoint, plus an edit made there since
+        backend_users = AccountStore({"1": account(500), "2": account(200)})
+        replayed, changed = self.replay(backend_users)
+        self.assertEqual(changed, {"2"})
+        self.assertEqual(replayed["1"]["balance"], 500)
+        self.assertEqual(replayed["2"]["balance"], 250)
+
+
+if __name__ == "__main__":
+    unittest.main()